@@ -12,14 +12,11 @@ import urllib.request
 from datetime import datetime, timedelta
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))  # for the shared .env loader
+from env_file import load_env
+
 # Load .env file
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data"
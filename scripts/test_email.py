@@ -11,14 +11,11 @@ import urllib.request
 from datetime import datetime
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))  # for the shared .env loader
+from env_file import load_env
+
 # Load .env
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 AGENT_MAIL_API_KEY = os.environ.get("AGENT_MAIL_API_KEY")
 OPERATOR_EMAIL = os.environ.get("OPERATOR_EMAIL")
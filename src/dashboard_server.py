@@ -33,6 +33,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Reply log written by reply_handler.py (JSON Lines; older installs have a JSON array)
+REPLIES_LOG = STATE_DIR / "email_replies.jsonl"
+LEGACY_REPLIES_LOG = STATE_DIR / "email_replies.json"
+
+
+def load_replies():
+    """Read all logged email replies."""
+    if REPLIES_LOG.exists():
+        with open(REPLIES_LOG) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if LEGACY_REPLIES_LOG.exists():
+        with open(LEGACY_REPLIES_LOG) as f:
+            return json.load(f)
+    return []
+
+
+def count_replies():
+    """Number of logged replies, without parsing the JSON Lines log."""
+    if REPLIES_LOG.exists():
+        with open(REPLIES_LOG, 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    return len(load_replies())
+
 
 class DashboardHandler(BaseHTTPRequestHandler):
     """HTTP request handler for dashboard."""
@@ -115,11 +138,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
                 sent_count = len(json.load(f))
         
         # Count replies
-        reply_count = 0
-        replies_path = STATE_DIR / "email_replies.json"
-        if replies_path.exists():
-            with open(replies_path) as f:
-                reply_count = len(json.load(f))
+        reply_count = count_replies()
         
         # Count pending leads
         pending_count = 0
@@ -162,11 +181,7 @@ class DashboardHandler(BaseHTTPRequestHandler):
     
     def _get_replies(self):
         """Get email replies."""
-        replies_path = STATE_DIR / "email_replies.json"
-        if replies_path.exists():
-            with open(replies_path) as f:
-                return json.load(f)
-        return []
+        return load_replies()
     
     def _get_recent_logs(self, lines=50):
         """Get recent log entries."""
@@ -272,7 +272,7 @@ class DocumentClassifier:
         """Classify document based on cleaned content."""
         # Strip navigation text first
         cleaned_text = DocumentClassifier.strip_nav_text(text)
-        cleaned_lower = cleaned_text.lower()[:5000]  # Check first 5000 chars of cleaned text
+        cleaned_lower = cleaned_text[:5000].lower()  # Check first 5000 chars of cleaned text
         
         # Check for high-signal agenda phrases
         has_agenda_phrase = any(phrase in cleaned_lower for phrase in DocumentClassifier.AGENDA_PHRASES)
@@ -10,7 +10,9 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
+
+from src.parser import FINGERPRINT_ALGORITHM, minhash_signature, minhash_similarity
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +43,16 @@ class ProductionDiff:
         r'^\s*\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\s*$',  # Bare dates
     ]
     
+    # Estimated Jaccard similarity above which a cheap line-set check is tried
+    # before the full line diff
+    NEAR_DUPLICATE_JACCARD = 0.98
+    
+    # Entries saved before fingerprints were tagged used truncated SHA-256
+    LEGACY_FINGERPRINT_ALGORITHM = 'sha256'
+    
+    # Stored text is truncated to this many characters
+    STORED_TEXT_CHARS = 5000
+    
     def __init__(self, state_dir: Path):
         self.state_dir = state_dir
         self.state_dir.mkdir(parents=True, exist_ok=True)
@@ -62,14 +74,40 @@ class ProductionDiff:
         with open(self.fingerprints_file, 'w') as f:
             json.dump(self.fingerprints, f, indent=2)
     
-    def compare(self, source_id: str, new_text: str, new_fingerprint: str) -> ChangeSummary:
+    def compare(self, source_id: str, new_text: Union[str, List[str]], new_fingerprint: str) -> ChangeSummary:
         """
         Compare new text against last known version.
         
+        new_text may be a list of document texts; they are joined with blank
+        lines (and MinHashed) only when the fingerprint changed. A near-duplicate
+        of the stored version whose changed lines are all noise skips the line
+        diff; anything else gets the full diff.
+        
         Returns ChangeSummary with detailed change information.
         """
-        old_fingerprint = self.fingerprints.get(source_id, {}).get('fingerprint', '')
-        old_text = self.fingerprints.get(source_id, {}).get('text', '')
+        stored = self.fingerprints.get(source_id, {})
+        old_fingerprint = stored.get('fingerprint', '')
+        old_text = stored.get('text', '')
+        old_minhash = stored.get('minhash')
+        
+        # A fingerprint made by another algorithm (xxhash installed or removed
+        # since the last run) says nothing; re-baseline if the text still matches
+        if old_fingerprint and stored.get('algorithm', self.LEGACY_FINGERPRINT_ALGORITHM) != FINGERPRINT_ALGORITHM:
+            if not isinstance(new_text, str):
+                new_text = "\n\n".join(new_text)
+            if new_text[:self.STORED_TEXT_CHARS] == old_text:
+                logger.info("Fingerprint algorithm changed for %s, re-baselining", source_id)
+                self._store(source_id, new_fingerprint, new_text, minhash_signature(new_text))
+                return ChangeSummary(
+                    changed=False,
+                    fingerprint_changed=False,
+                    added_lines=[],
+                    removed_lines=[],
+                    percent_changed=0.0,
+                    noise_only=False,
+                    old_fingerprint=old_fingerprint,
+                    new_fingerprint=new_fingerprint
+                )
         
         # Quick check: if fingerprint unchanged, no meaningful change
         if new_fingerprint == old_fingerprint:
@@ -85,7 +123,19 @@ class ProductionDiff:
             )
         
         # Fingerprint changed, do detailed diff
-        added, removed = self._compute_diff(old_text, new_text)
+        if not isinstance(new_text, str):
+            new_text = "\n\n".join(new_text)
+        new_minhash = minhash_signature(new_text)
+        
+        if self._is_near_duplicate(old_minhash, new_minhash):
+            # Cheap order-insensitive check first; difflib only if it finds real lines
+            added, removed = self._line_set_diff(old_text, new_text)
+            if self._is_noise_only(added, removed):
+                logger.debug("Near-duplicate content for %s, skipping diff", source_id)
+            else:
+                added, removed = self._compute_diff(old_text, new_text)
+        else:
+            added, removed = self._compute_diff(old_text, new_text)
         
         # Check if it's only noise
         noise_only = self._is_noise_only(added, removed)
@@ -94,12 +144,7 @@ class ProductionDiff:
         percent = self._calculate_percent_changed(old_text, new_text)
         
         # Store new fingerprint and text
-        self.fingerprints[source_id] = {
-            'fingerprint': new_fingerprint,
-            'text': new_text[:5000],  # Store truncated for space
-            'updated_at': datetime.now().isoformat()
-        }
-        self._save_fingerprints()
+        self._store(source_id, new_fingerprint, new_text, new_minhash)
         
         return ChangeSummary(
             changed=not noise_only and (len(added) > 0 or len(removed) > 0),
@@ -112,6 +157,36 @@ class ProductionDiff:
             new_fingerprint=new_fingerprint
         )
     
+    def _store(self, source_id: str, fingerprint: str, text: str, minhash: Optional[bytes]):
+        """Record the new baseline for a source and save it."""
+        self.fingerprints[source_id] = {
+            'fingerprint': fingerprint,
+            'algorithm': FINGERPRINT_ALGORITHM,
+            'text': text[:self.STORED_TEXT_CHARS],  # Store truncated for space
+            'minhash': minhash.hex() if minhash else None,
+            'updated_at': datetime.now().isoformat()
+        }
+        self._save_fingerprints()
+    
+    def _is_near_duplicate(self, old_minhash: Optional[str], new_minhash: Optional[bytes]) -> bool:
+        """Check whether two MinHash signatures are above the similarity threshold."""
+        if not old_minhash or not new_minhash:
+            return False
+        try:
+            old_signature = bytes.fromhex(old_minhash)
+        except ValueError:
+            return False
+        return minhash_similarity(old_signature, new_minhash) > self.NEAR_DUPLICATE_JACCARD
+    
+    def _line_set_diff(self, old_text: str, new_text: str) -> Tuple[List[str], List[str]]:
+        """Lines only in one version (ignoring order), with noise lines dropped."""
+        old_lines = set(line.strip() for line in old_text.split('\n')) if old_text else set()
+        new_lines = set(line.strip() for line in new_text.split('\n')) if new_text else set()
+        
+        added = [line for line in new_lines - old_lines if line and not self._is_noise_line(line)]
+        removed = [line for line in old_lines - new_lines if line and not self._is_noise_line(line)]
+        return added, removed
+    
     def _compute_diff(self, old_text: str, new_text: str) -> Tuple[List[str], List[str]]:
         """Compute line-by-line diff."""
         old_lines = old_text.split('\n') if old_text else []
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+.env loader shared by the src/, scripts/ and v2/ entry points.
+Reads KEY=value lines into os.environ; comment lines never match.
+"""
+
+import os
+import re
+from pathlib import Path
+
+# One KEY=value assignment per line; surrounding blanks are trimmed
+_ENV_LINE_RE = re.compile(r'^[ \t]*([A-Za-z_][A-Za-z0-9_]*)=(.*?)[ \t\r]*$', re.MULTILINE)
+
+
+def _unquote(value: str) -> str:
+    """Drop one pair of matching single or double quotes around a value."""
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+
+def load_env(path: Path):
+    """Load a .env file into os.environ (a missing file is not an error)."""
+    if not path.exists():
+        return
+    for key, value in _ENV_LINE_RE.findall(path.read_text()):
+        os.environ[key] = _unquote(value)
@@ -3,13 +3,13 @@
 Production Fetcher - Hardened with retries, caching, and resilience
 """
 
-import gzip
 import hashlib
 import json
 import logging
 import random
 import re
 import ssl
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +18,12 @@ from urllib.parse import urljoin, urlparse
 import urllib.request
 import urllib.error
 
+# zlib-ng's gzip module is a drop-in replacement with a faster inflate
+try:
+    from zlib_ng import gzip_ng as gzip
+except ImportError:
+    import gzip
+
 logger = logging.getLogger(__name__)
 
 class ProductionFetcher:
@@ -46,6 +52,7 @@ class ProductionFetcher:
         
         # Per-source rate limiting (domain -> last_fetch_time)
         self.last_fetch: Dict[str, float] = {}
+        self._rate_lock = threading.Lock()
         self.min_delay = 2.0  # Minimum seconds between requests to same domain
         
     def fetch(self, url: str, source_id: str) -> Tuple[Optional[bytes], Dict]:
@@ -171,15 +178,20 @@ class ProductionFetcher:
         return content, meta
     
     def _rate_limit(self, domain: str):
-        """Enforce rate limiting per domain."""
-        now = time.time()
-        if domain in self.last_fetch:
-            elapsed = now - self.last_fetch[domain]
-            if elapsed < self.min_delay:
-                sleep_time = self.min_delay - elapsed
-                logger.debug(f"Rate limiting {domain}: sleeping {sleep_time:.2f}s")
-                time.sleep(sleep_time)
-        self.last_fetch[domain] = now
+        """Enforce rate limiting per domain (safe to call from several threads)."""
+        # Reserve the next slot under the lock, then sleep outside it
+        with self._rate_lock:
+            now = time.time()
+            sleep_time = 0.0
+            if domain in self.last_fetch:
+                elapsed = now - self.last_fetch[domain]
+                if elapsed < self.min_delay:
+                    sleep_time = self.min_delay - elapsed
+            self.last_fetch[domain] = now + sleep_time
+        
+        if sleep_time > 0:
+            logger.debug(f"Rate limiting {domain}: sleeping {sleep_time:.2f}s")
+            time.sleep(sleep_time)
     
     def _exponential_backoff(self, attempt: int) -> float:
         """Calculate backoff with jitter."""
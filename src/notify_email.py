@@ -15,14 +15,13 @@ from email.mime.multipart import MIMEMultipart
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    from env_file import load_env
+except ImportError:  # Imported as src.<module>
+    from src.env_file import load_env
+
 # Load .env file
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -14,14 +14,13 @@ import urllib.request
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from env_file import load_env
+except ImportError:  # Imported as src.<module>
+    from src.env_file import load_env
+
 # Load .env file
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 # Configuration
 LEADS_FILE = Path.home() / "Downloads" / "outreach_leads.txt"
@@ -47,6 +46,9 @@ logger = logging.getLogger(__name__)
 
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Trailing TLD stripped from a lead's email domain to guess the company name
+_TLD_RE = re.compile(r'\.(?:com|org|net|gov|edu|io)$', re.IGNORECASE)
+
 
 class OutreachWorker:
     """Researches leads and sends personalized outreach emails."""
@@ -170,7 +172,7 @@ class OutreachWorker:
         
         # Extract domain for company research
         domain = email.split('@')[-1]
-        company = domain.replace('.com', '').replace('.org', '').replace('.net', '').title()
+        company = _TLD_RE.sub('', domain).title()
         
         research_points = []
         
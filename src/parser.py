@@ -3,15 +3,245 @@
 Production Parser - Robust HTML/PDF text extraction with fallbacks
 """
 
+import concurrent.futures
 import hashlib
-import re
+import io
 import logging
+import multiprocessing
+import os
+import pickle
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass
+from html import unescape
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    from datasketch import MinHash
+except ImportError:
+    MinHash = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns (hot path: every parsed document runs through these)
+_RE_SCRIPT_END = re.compile(r'</script\s*>', re.IGNORECASE)
+_RE_STYLE_END = re.compile(r'</style\s*>', re.IGNORECASE)
+# Characters that can end a tag name ('<scriptfoo>' is not a script tag)
+_TAG_NAME_END = frozenset(' \t\n\r\f/>')
+
+# Main-content containers, in priority order (a container must hold > 500 chars).
+# Both HTML paths must pick the same text, or fingerprints would depend on
+# whether selectolax is installed: class matching is case-insensitive in both
+_MAIN_CONTENT_SELECTORS = ('main', 'article', 'div[class*="content" i]', 'div[class*="main" i]')
+_MAIN_CONTENT_KINDS = ('main', 'article', 'div.content', 'div.main')
+_MAIN_CONTENT_MIN_CHARS = 500
+_BOILERPLATE_SELECTOR = 'script, style'
+
+# PDF noise: bare page numbers / "Page X of Y" (group 'page') or running headers
+# (group 'header'). Only lines starting with one of the prefix chars can match.
+_RE_PDF_NOISE = re.compile(
+    r'^(?:\s*(?P<page>\d+|page\s+\d+\s+of\s+\d+)\s*$'
+    r'|(?P<header>city\s+of|agenda|meeting|date:|time:))',
+    re.IGNORECASE
+)
+_PDF_NOISE_PREFIXES = frozenset(' \t\r\f\v0123456789PpCcAaMmDdTt')
+
+_RE_HYPHEN_WRAP = re.compile(r'(\w)-\s*\n\s*(\w)')
+_RE_WS = re.compile(r'\s+')
+_RE_BLANKLINES = re.compile(r'\n\s*\n+')
+
+# Unicode punctuation/space folding for _normalize_text (one pass via str.translate)
+_UNICODE_TABLE = str.maketrans({
+    '\xa0': ' ',    # Non-breaking space
+    '\u2013': '-',  # En dash
+    '\u2014': '-',  # Em dash
+    '\u2018': "'",  # Smart quotes
+    '\u2019': "'",
+    '\u201c': '"',
+    '\u201d': '"',
+})
+
+# Content sniffing: look past a UTF-8 BOM and leading whitespace for markup
+_SNIFF_BYTES = 1024
+_SNIFF_SKIP = b' \t\r\n\f\xef\xbb\xbf'
+
+# Streaming fingerprint: hash in fixed-size chunks, folding line breaks/tabs to spaces
+_FINGERPRINT_CHUNK = 64 * 1024
+_WS_TABLE = str.maketrans('\t\n\r\f\v', '     ')
+
+# Near-duplicate detection: MinHash over character shingles (needs datasketch),
+# fed in bounded batches (datasketch allocates batch x permutations uint64s)
+_MINHASH_PERMUTATIONS = 64
+_MINHASH_SHINGLE = 10
+_MINHASH_BATCH = 4096
+
+
+# Fingerprints are only comparable when made by the same algorithm, which depends
+# on whether xxhash is installed; stored fingerprints are tagged with this name
+FINGERPRINT_ALGORITHM = 'xxh3_64' if xxhash is not None else 'sha256'
+
+
+def content_fingerprint(data: bytes, use_cryptographic: bool = False) -> str:
+    """
+    16-hex-char fingerprint for dedup/change detection.
+    
+    Uses xxh3-64 when xxhash is installed (not a security boundary), else the
+    legacy truncated SHA-256 (see FINGERPRINT_ALGORITHM). Pass
+    use_cryptographic=True to force SHA-256.
+    """
+    if xxhash is not None and not use_cryptographic:
+        return xxhash.xxh3_64_hexdigest(data)
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def content_fingerprint_many(texts: Iterable[str], separator: str = "\n\n") -> str:
+    """
+    Same result as content_fingerprint(separator.join(texts).encode()), but
+    hashes each text incrementally instead of building the joined string.
+    """
+    hasher = _new_hasher()
+    sep = separator.encode()
+    for index, text in enumerate(texts):
+        if index:
+            hasher.update(sep)
+        hasher.update(text.encode())
+    return hasher.hexdigest()[:16]
+
+
+def minhash_signature(text: str) -> Optional[bytes]:
+    """
+    MinHash signature of the text's character shingles, or None when
+    datasketch is not installed or the text is shorter than one shingle.
+    
+    Shingles are hashed _MINHASH_BATCH at a time, so memory stays flat
+    however long the document is (repeats don't change a MinHash).
+    """
+    if MinHash is None or len(text) < _MINHASH_SHINGLE:
+        return None
+    minhash = MinHash(num_perm=_MINHASH_PERMUTATIONS)
+    shingle_count = len(text) - _MINHASH_SHINGLE + 1
+    for start in range(0, shingle_count, _MINHASH_BATCH):
+        stop = min(start + _MINHASH_BATCH, shingle_count)
+        minhash.update_batch([text[i:i + _MINHASH_SHINGLE].encode() for i in range(start, stop)])
+    return minhash.hashvalues.astype('uint64').tobytes()
+
+
+def minhash_similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures (0.0 if incompatible)."""
+    values_a, values_b = array('Q', a), array('Q', b)
+    if not values_a or len(values_a) != len(values_b):
+        return 0.0
+    return sum(x == y for x, y in zip(values_a, values_b)) / len(values_a)
+
+
+def _new_hasher():
+    """Incremental hasher producing the same digest as content_fingerprint()."""
+    if xxhash is not None:
+        return xxhash.xxh3_64()
+    return hashlib.sha256()
+
+
+def _strip_html(text: str, strip_tags: bool = True) -> str:
+    """
+    Remove <script>/<style> blocks and comments in a single linear scan.
+    
+    With strip_tags=True every other tag is replaced by a space as well;
+    otherwise remaining markup is kept so content containers can still be found.
+    Unterminated blocks run to the end of the document, as in a browser.
+    """
+    parts = []
+    pos = 0
+    
+    while True:
+        lt = text.find('<', pos)
+        if lt == -1:
+            parts.append(text[pos:])
+            break
+        parts.append(text[pos:lt])
+        
+        head = text[lt + 1:lt + 8].lower()
+        if head[:6] == 'script' and head[6:7] in _TAG_NAME_END:
+            end_re = _RE_SCRIPT_END
+        elif head[:5] == 'style' and head[5:6] in _TAG_NAME_END:
+            end_re = _RE_STYLE_END
+        else:
+            end_re = None
+        
+        if end_re is not None:
+            match = end_re.search(text, lt)
+            if match is None:
+                break
+            pos = match.end()
+        elif head[:3] == '!--':
+            end = text.find('-->', lt + 4)
+            if end == -1:
+                break
+            pos = end + 3
+        else:
+            gt = text.find('>', lt + 1)
+            if gt == -1:
+                parts.append(text[lt:])
+                break
+            if not strip_tags:
+                parts.append(text[lt:gt + 1])
+                pos = gt + 1
+                continue
+            pos = gt + 1
+        parts.append(' ')
+    
+    return ''.join(parts)
+
+
+def _largest_container(texts: List[str]) -> Optional[str]:
+    """
+    Largest of one kind's container texts if it is substantial, else None.
+    
+    Sizes are compared with whitespace collapsed, so the stdlib and
+    selectolax paths agree despite placing separators differently.
+    """
+    best, best_size = None, _MAIN_CONTENT_MIN_CHARS
+    for text in texts:
+        size = len(_RE_WS.sub(' ', text).strip())
+        if size > best_size:
+            best, best_size = text, size
+    return best
+
+
+def _strip_html_fast(html_text: str) -> Tuple[str, bool]:
+    """
+    Extract text with selectolax (lexbor) in a single C-level parse.
+    
+    Same rules as the stdlib path: drops script/style, then returns the
+    largest substantial container of the first kind that has one, otherwise
+    the whole document. Returns (text, found_main).
+    """
+    tree = SelectolaxHTMLParser(html_text)
+    for node in tree.css(_BOILERPLATE_SELECTOR):
+        node.decompose()
+    
+    for selector in _MAIN_CONTENT_SELECTORS:
+        largest = _largest_container([node.text(separator=' ') for node in tree.css(selector)])
+        if largest is not None:
+            return largest, True
+    
+    root = tree.root
+    return (root.text(separator=' ') if root is not None else ''), False
+
 @dataclass
 class ParsedDoc:
     """Result of parsing a document."""
@@ -26,19 +256,130 @@ class ParsedDoc:
             self.parse_warnings = []
         # Calculate fingerprint if not provided
         if not self.fingerprint and self.text:
-            normalized = self._normalize_for_fingerprint(self.text)
-            self.fingerprint = hashlib.sha256(normalized.encode()).hexdigest()[:16]
+            self.fingerprint = self._fingerprint_text(self.text)
+    
+    @staticmethod
+    def _fingerprint_text(text: str, stable_order: bool = False) -> str:
+        """
+        Fingerprint text case-insensitively without building a normalized copy.
+        
+        Text is fed to the hasher in 64 KB chunks. It is expected to already be
+        whitespace-normalized by _normalize_text. stable_order=True restores the
+        legacy sorted-lines normalization.
+        """
+        if stable_order:
+            return content_fingerprint(ParsedDoc._normalize_for_fingerprint(text).encode())
+        
+        hasher = _new_hasher()
+        for start in range(0, len(text), _FINGERPRINT_CHUNK):
+            chunk = text[start:start + _FINGERPRINT_CHUNK]
+            hasher.update(chunk.lower().translate(_WS_TABLE).encode())
+        return hasher.hexdigest()[:16]
     
     @staticmethod
     def _normalize_for_fingerprint(text: str) -> str:
         """Normalize text for stable fingerprinting."""
         # Lowercase, remove extra whitespace, sort lines
         lines = text.lower().split('\n')
-        lines = [re.sub(r'\s+', ' ', line).strip() for line in lines]
+        lines = [_RE_WS.sub(' ', line).strip() for line in lines]
         lines = sorted([l for l in lines if len(l) > 3])
         return '\n'.join(lines)
 
 
+def _extract_pages_worker(content: bytes, backend: str, start: int, stop: int) -> List[Tuple[str, Optional[str]]]:
+    """
+    Process-pool worker: extract text for pages [start, stop).
+    
+    Returns (text, error) per page. Runs in a spawned process, so the
+    backend is imported here rather than taken from the parser.
+    """
+    results = []
+    
+    if backend == 'pdfium':
+        import pypdfium2
+        pdf = pypdfium2.PdfDocument(content)
+        try:
+            for index in range(start, stop):
+                try:
+                    results.append((pdf[index].get_textpage().get_text_range() or "", None))
+                except Exception as e:
+                    results.append(("", str(e)))
+        finally:
+            pdf.close()
+    else:
+        try:
+            import pypdf
+        except ImportError:
+            import PyPDF2 as pypdf
+        reader = pypdf.PdfReader(io.BytesIO(content))
+        for index in range(start, stop):
+            try:
+                results.append((reader.pages[index].extract_text() or "", None))
+            except Exception as e:
+                results.append(("", str(e)))
+    
+    return results
+
+
+class _MainContentFinder(HTMLParser):
+    """
+    Single-pass stdlib fallback for locating main-content containers.
+    
+    Collects the text of every main/article/div.content/div.main element
+    in one feed; container_text() then picks by priority.
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self.open = []  # (tag, kinds, chunk index) for open div/main/article
+        self.found = {kind: [] for kind in _MAIN_CONTENT_KINDS}
+    
+    def handle_starttag(self, tag, attrs):
+        self.chunks.append(' ')
+        if tag not in ('main', 'article', 'div'):
+            return
+        
+        if tag == 'div':
+            css_class = (dict(attrs).get('class') or '').lower()
+            kinds = tuple(kind for kind in ('div.content', 'div.main') if kind[4:] in css_class)
+        else:
+            kinds = (tag,)
+        self.open.append((tag, kinds, len(self.chunks)))
+    
+    def handle_endtag(self, tag):
+        self.chunks.append(' ')
+        if tag not in ('main', 'article', 'div'):
+            return
+        
+        # Close the innermost matching element (and anything left unclosed inside it)
+        for depth in range(len(self.open) - 1, -1, -1):
+            if self.open[depth][0] == tag:
+                while len(self.open) > depth:
+                    self._close(*self.open.pop())
+                break
+    
+    def handle_data(self, data):
+        self.chunks.append(data)
+    
+    def _close(self, tag, kinds, start):
+        if kinds:
+            text = ''.join(self.chunks[start:])
+            for kind in kinds:
+                self.found[kind].append(text)
+    
+    def container_text(self) -> Optional[str]:
+        self.close()
+        while self.open:
+            self._close(*self.open.pop())
+        
+        for kind in _MAIN_CONTENT_KINDS:
+            largest = _largest_container(self.found[kind])
+            if largest is not None:
+                return largest
+        return None
+
+
 class ProductionParser:
     """Robust parser for HTML and PDF documents."""
     
@@ -48,44 +389,226 @@ class ProductionParser:
     # Minimum text length to consider successful
     MIN_TEXT_LENGTH = 100
     
-    def __init__(self):
+    # PDFs with at least this many pages are extracted across processes. Spawning
+    # a worker and importing the backend costs ~150 ms (pdfium) / ~350 ms (pypdf)
+    # and every worker re-opens the whole PDF, against ~3 / ~11 ms per page serially
+    PARALLEL_MIN_PAGES = {'pdfium': 128, 'pypdf': 64}
+    
+    # Parse results cached per (content hash, parse path); bump when parsing changes
+    PARSE_CACHE_VERSION = 3
+    PARSE_MEMO_SIZE = 128
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self._parse_cache_dir = cache_dir / 'parsed' if cache_dir else None
+        if self._parse_cache_dir:
+            self._parse_cache_dir.mkdir(parents=True, exist_ok=True)
+        self._parse_memo: "OrderedDict[str, ParsedDoc]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._max_workers = os.cpu_count() or 1
+        self._pdf_extractors = {
+            'pdfium': self._extract_pdf_pdfium,
+            'pypdf': self._extract_pdf_pypdf,
+            'pdfplumber': self._extract_pdf_pdfplumber,
+        }
         self.pdf_available = self._check_pdf_support()
+        self._dispatch = {
+            'html': self._parse_html,
+            'pdf': self._parse_pdf,
+            'text': self._parse_text,
+        }
     
     def _check_pdf_support(self) -> bool:
-        """Check if PDF extraction is available."""
+        """Check if PDF extraction is available and bind backend handles once."""
+        self._BytesIO = io.BytesIO
+        self._pdf_backends = []
+        
         try:
-            # Try PyPDF2 first (lightweight, pure Python)
-            import PyPDF2
-            return True
+            # Prefer PDFium (C++ backend, much faster than pure-Python parsers)
+            import pypdfium2
+            self._PdfiumDocument = pypdfium2.PdfDocument
+            self._pdf_backends.append('pdfium')
         except ImportError:
+            pass
+        
+        try:
+            # Then pypdf (lightweight, pure Python), or its deprecated PyPDF2 name
             try:
-                # Fallback to pdfplumber
-                import pdfplumber
-                return True
+                import pypdf
             except ImportError:
-                logger.warning("PDF libraries not available. PDF parsing disabled.")
-                return False
+                import PyPDF2 as pypdf
+            self._PdfReader = pypdf.PdfReader
+            self._pdf_backends.append('pypdf')
+        except ImportError:
+            pass
+        
+        try:
+            # Fallback to pdfplumber
+            import pdfplumber
+            self._pdfplumber_open = pdfplumber.open
+            self._pdf_backends.append('pdfplumber')
+        except ImportError:
+            pass
+        
+        self._pdf_backend = self._pdf_backends[0] if self._pdf_backends else None
+        if self._pdf_backend is None:
+            logger.warning("PDF libraries not available. PDF parsing disabled.")
+            return False
+        return True
+    
+    def close(self):
+        """Shut down the page-extraction process pool, if one was started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+    
+    def _get_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        """Lazily start the page-extraction pool (spawn: no parser state is copied)."""
+        # parse() runs on the pipeline's worker threads; only one may create the pool
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+    
+    def _extract_pages_parallel(self, content: bytes, backend: str, page_count: int,
+                                warnings: List[str]) -> Optional[List[str]]:
+        """Extract pages in contiguous ranges across processes; None if the pool fails."""
+        workers = min(self._max_workers, page_count)
+        step = -(-page_count // workers)
+        starts = range(0, page_count, step)
+        
+        try:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_extract_pages_worker, content, backend, start, min(start + step, page_count))
+                for start in starts
+            ]
+            page_results = [page for future in futures for page in future.result()]
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction failed, falling back to serial: {e}")
+            self.close()
+            return None
+        
+        pages_text = []
+        for page_text, error in page_results:
+            if error:
+                warnings.append(f"page_extraction_error:{error}")
+            elif page_text:
+                pages_text.append(page_text + "\n")
+        return pages_text
     
     def parse(self, content: bytes, content_type: str, url: str, source_id: str) -> ParsedDoc:
         """
         Parse content based on type.
         
         Returns ParsedDoc with extracted text, confidence score, and fingerprint.
+        Parsing is pure in (content, parse path), so results are cached by
+        content hash in memory and, when a cache_dir was given, on disk.
         """
-        content_type = content_type.lower()
+        kind = self._content_kind(content, content_type.lower(), url)
+        key = f"v{self.PARSE_CACHE_VERSION}-{kind}-{content_fingerprint(content)}"
+        
+        cached = self._get_cached_parse(key)
+        if cached is not None:
+            return cached
+        
+        handler = self._dispatch.get(kind)
+        if handler is not None:
+            doc = handler(content, source_id)
+        else:
+            # Try HTML first, then plain text
+            try:
+                doc = self._parse_html(content, source_id)
+            except Exception as e:
+                logger.warning(f"HTML parse failed for {source_id}, falling back to text: {e}")
+                doc = self._parse_text(content, source_id)
+        
+        # Empty results (e.g. no PDF library yet) are not worth pinning
+        if doc.text:
+            self._cache_parse(key, doc)
+        return doc
+    
+    def _content_kind(self, content: bytes, content_type: str, url: str) -> str:
+        """
+        Decide which parse path handles this content.
+        
+        The leading bytes are authoritative (PDF magic, or markup starting
+        with '<'); content type and URL suffix only decide the rest.
+        """
+        if content[:4] == b'%PDF':
+            return 'pdf'
+        if content[:_SNIFF_BYTES].lstrip(_SNIFF_SKIP)[:1] == b'<':
+            return 'html'
         
         if 'html' in content_type or url.endswith('.html') or url.endswith('.htm'):
-            return self._parse_html(content, source_id)
+            return 'html'
         elif 'pdf' in content_type or url.endswith('.pdf'):
-            return self._parse_pdf(content, source_id)
+            return 'pdf'
         elif 'text' in content_type:
-            return self._parse_text(content, source_id)
-        else:
-            # Try HTML first, then plain text
+            return 'text'
+        return 'unknown'
+    
+    def _get_cached_parse(self, key: str) -> Optional[ParsedDoc]:
+        """Look up a parse result in memory, then on disk."""
+        with self._memo_lock:
+            doc = self._parse_memo.get(key)
+            if doc is not None:
+                self._parse_memo.move_to_end(key)
+                return doc
+        
+        if not self._parse_cache_dir:
+            return None
+        cache_file = self._parse_cache_dir / f"{key}.pkl"
+        if not cache_file.exists():
+            return None
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                doc = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Parse cache read error: {e}")
+            return None
+        
+        self._remember_parse(key, doc)
+        return doc
+    
+    def _cache_parse(self, key: str, doc: ParsedDoc):
+        """Store a parse result in memory and on disk."""
+        self._remember_parse(key, doc)
+        
+        if not self._parse_cache_dir:
+            return
+        try:
+            with open(self._parse_cache_dir / f"{key}.pkl", 'wb') as f:
+                pickle.dump(doc, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Parse cache write error: {e}")
+    
+    def _remember_parse(self, key: str, doc: ParsedDoc):
+        with self._memo_lock:
+            self._parse_memo[key] = doc
+            self._parse_memo.move_to_end(key)
+            while len(self._parse_memo) > self.PARSE_MEMO_SIZE:
+                self._parse_memo.popitem(last=False)
+    
+    def clean_old_cache(self, max_age_days: int = 7):
+        """Remove on-disk parse results older than max_age_days."""
+        if not self._parse_cache_dir:
+            return
+        cutoff = time.time() - (max_age_days * 86400)
+        
+        for cache_file in self._parse_cache_dir.glob('*.pkl'):
             try:
-                return self._parse_html(content, source_id)
-            except:
-                return self._parse_text(content, source_id)
+                if cache_file.stat().st_mtime < cutoff:
+                    cache_file.unlink()
+            except Exception as e:
+                logger.warning(f"Parse cache cleanup error: {e}")
     
     def _parse_html(self, content: bytes, source_id: str) -> ParsedDoc:
         """Parse HTML with layout-aware extraction."""
@@ -96,17 +619,18 @@ class ProductionParser:
         except:
             text = content.decode('latin-1', errors='replace')
         
-        # Remove scripts and styles
-        text = re.sub(r'<script[^>]*>.*?</script>', ' ', text, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', ' ', text, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Try to extract main content
-        main_content = self._extract_main_content(text)
-        if main_content:
-            text = main_content
+        if SelectolaxHTMLParser is not None:
+            text, found_main = _strip_html_fast(text)
         else:
-            # Fallback: strip all tags
-            text = re.sub(r'<[^>]+>', ' ', text)
+            # Remove scripts, styles and comments
+            text = _strip_html(text, strip_tags=False)
+            
+            # Try to extract main content, else fall back to stripping all tags
+            main_content = self._extract_main_content(text)
+            found_main = main_content is not None
+            text = main_content if found_main else unescape(_strip_html(text))
+        
+        if not found_main:
             warnings.append("no_main_element_found")
         
         # Normalize
@@ -128,24 +652,14 @@ class ProductionParser:
         )
     
     def _extract_main_content(self, html: str) -> Optional[str]:
-        """Extract main content area from HTML."""
-        # Try common content containers
-        patterns = [
-            r'<main[^>]*>(.*?)</main>',
-            r'<article[^>]*>(.*?)</article>',
-            r'<div[^>]*class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>',
-            r'<div[^>]*class=["\'][^"\']*main[^"\']*["\'][^>]*>(.*?)</div>',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-            if matches:
-                # Take the largest match
-                largest = max(matches, key=len)
-                if len(largest) > 500:  # Must be substantial
-                    return largest
-        
-        return None
+        """Extract the text of the main content area from HTML, in one pass."""
+        finder = _MainContentFinder()
+        try:
+            finder.feed(html)
+        except Exception as e:
+            logger.debug(f"Main content scan failed: {e}")
+            return None
+        return finder.container_text()
     
     def _parse_pdf(self, content: bytes, source_id: str) -> ParsedDoc:
         """Parse PDF with fallback methods."""
@@ -162,42 +676,13 @@ class ProductionParser:
                 confidence=0.0
             )
         
-        # Try PyPDF2 first
-        try:
-            import PyPDF2
-            from io import BytesIO
-            
-            reader = PyPDF2.PdfReader(BytesIO(content))
-            page_count = len(reader.pages)
-            
-            for page in reader.pages:
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                except Exception as e:
-                    warnings.append(f"page_extraction_error:{e}")
-            
-        except Exception as e:
-            warnings.append(f"pypdf2_error:{e}")
-            
-            # Try pdfplumber fallback
+        # Preferred backend first, remaining ones as fallbacks
+        for backend in self._pdf_backends:
             try:
-                import pdfplumber
-                from io import BytesIO
-                
-                with pdfplumber.open(BytesIO(content)) as pdf:
-                    page_count = len(pdf.pages)
-                    for page in pdf.pages:
-                        try:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n"
-                        except:
-                            pass
-                            
-            except Exception as e2:
-                warnings.append(f"pdfplumber_error:{e2}")
+                text, page_count = self._pdf_extractors[backend](content, warnings)
+                break
+            except Exception as e:
+                warnings.append(f"{backend}_error:{e}")
         
         # Normalize
         text = self._normalize_text(text)
@@ -219,29 +704,103 @@ class ProductionParser:
             confidence=confidence
         )
     
+    def _extract_pdf_pdfium(self, content: bytes, warnings: List[str]) -> Tuple[str, int]:
+        """Extract page text with pypdfium2."""
+        pdf = self._PdfiumDocument(content)
+        pages_text = []
+        
+        try:
+            page_count = len(pdf)
+            if page_count >= self.PARALLEL_MIN_PAGES['pdfium'] and self._max_workers > 1:
+                parallel = self._extract_pages_parallel(content, 'pdfium', page_count, warnings)
+                if parallel is not None:
+                    return "".join(parallel), page_count
+            for page in pdf:
+                try:
+                    page_text = page.get_textpage().get_text_range()
+                    if page_text:
+                        pages_text.append(page_text + "\n")
+                except Exception as e:
+                    warnings.append(f"page_extraction_error:{e}")
+        finally:
+            pdf.close()
+        
+        return "".join(pages_text), page_count
+    
+    def _extract_pdf_pypdf(self, content: bytes, warnings: List[str]) -> Tuple[str, int]:
+        """Extract page text with pypdf (or PyPDF2)."""
+        reader = self._PdfReader(self._BytesIO(content))
+        pages_text = []
+        
+        page_count = len(reader.pages)
+        if page_count >= self.PARALLEL_MIN_PAGES['pypdf'] and self._max_workers > 1:
+            parallel = self._extract_pages_parallel(content, 'pypdf', page_count, warnings)
+            if parallel is not None:
+                return "".join(parallel), page_count
+        
+        for page in reader.pages:
+            try:
+                page_text = page.extract_text()
+                if page_text:
+                    pages_text.append(page_text + "\n")
+            except Exception as e:
+                warnings.append(f"page_extraction_error:{e}")
+        
+        return "".join(pages_text), page_count
+    
+    def _extract_pdf_pdfplumber(self, content: bytes, warnings: List[str]) -> Tuple[str, int]:
+        """Extract page text with pdfplumber."""
+        pages_text = []
+        
+        with self._pdfplumber_open(self._BytesIO(content)) as pdf:
+            for page in pdf.pages:
+                try:
+                    page_text = page.extract_text()
+                    if page_text:
+                        pages_text.append(page_text + "\n")
+                except Exception:
+                    pass
+            page_count = len(pdf.pages)
+        
+        return "".join(pages_text), page_count
+    
     def _strip_pdf_artifacts(self, text: str) -> str:
         """Remove common PDF header/footer noise."""
-        lines = text.split('\n')
-        cleaned = []
-        
-        for line in lines:
-            # Skip page numbers
-            if re.match(r'^\s*\d+\s*$', line):
-                continue
-            # Skip "Page X of Y"
-            if re.match(r'(?i)^\s*page\s+\d+\s+of\s+\d+\s*$', line):
-                continue
-            # Skip repeated headers (common in agendas)
-            if len(line) < 50 and re.match(r'(?i)^(city\s+of|agenda|meeting|date:|time:)', line):
-                # Keep first occurrence, skip repeats
-                if line not in cleaned[-3:] if cleaned else True:
-                    pass  # Keep it
-                else:
-                    continue
+        # Walk the text line by line with find() and write survivors straight
+        # to a buffer, so no list of all lines is ever built
+        out = io.StringIO()
+        seen_headers = set()
+        wrote_line = False
+        start = 0
+        
+        while True:
+            newline = text.find('\n', start)
+            line = text[start:newline] if newline != -1 else text[start:]
+            keep = True
+            
+            # Cheap first-char test keeps most lines away from the regex
+            if line and line[0] in _PDF_NOISE_PREFIXES:
+                match = _RE_PDF_NOISE.match(line)
+                if match:
+                    if match.group('page'):
+                        # Skip page numbers and "Page X of Y"
+                        keep = False
+                    elif len(line) < 50:
+                        # Skip repeated headers (common in agendas), keep first occurrence
+                        keep = line not in seen_headers
+                        seen_headers.add(line)
+            
+            if keep:
+                if wrote_line:
+                    out.write('\n')
+                out.write(line)
+                wrote_line = True
             
-            cleaned.append(line)
+            if newline == -1:
+                break
+            start = newline + 1
         
-        return '\n'.join(cleaned)
+        return out.getvalue()
     
     def _parse_text(self, content: bytes, source_id: str) -> ParsedDoc:
         """Parse plain text."""
@@ -262,22 +821,19 @@ class ProductionParser:
     def _normalize_text(self, text: str) -> str:
         """Normalize extracted text."""
         # Fix Unicode issues
-        text = text.replace('\xa0', ' ')  # Non-breaking space
-        text = text.replace('\u2013', '-')  # En dash
-        text = text.replace('\u2014', '-')  # Em dash
-        text = text.replace('\u2018', "'")  # Smart quotes
-        text = text.replace('\u2019', "'")
-        text = text.replace('\u201c', '"')
-        text = text.replace('\u201d', '"')
-        
-        # Fix hyphenation
-        text = re.sub(r'(\w)-\s*\n\s*(\w)', r'\1\2', text)
-        
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
-        
-        return text.strip()
+        text = text.translate(_UNICODE_TABLE)
+        
+        # Split paragraphs first so blank-line breaks survive whitespace collapsing
+        paragraphs = []
+        for paragraph in _RE_BLANKLINES.split(text):
+            # Fix hyphenation
+            paragraph = _RE_HYPHEN_WRAP.sub(r'\1\2', paragraph)
+            # Normalize whitespace
+            paragraph = _RE_WS.sub(' ', paragraph).strip()
+            if paragraph:
+                paragraphs.append(paragraph)
+        
+        return '\n\n'.join(paragraphs)
     
     def _calculate_html_confidence(self, text: str, warnings: List[str]) -> float:
         """Calculate confidence score for HTML parse."""
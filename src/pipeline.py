@@ -3,13 +3,24 @@
 Production Pipeline - Complete fetch → parse → diff → match → notify workflow
 """
 
+import concurrent.futures
 import json
 import logging
 import os
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 
+from src.diff import ProductionDiff
+from src.fetcher import ProductionFetcher
+from src.parser import FINGERPRINT_ALGORITHM, ProductionParser, content_fingerprint, content_fingerprint_many
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Setup logging
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -24,9 +35,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_BANNER = "=" * 60
+
 class ProductionPipeline:
     """End-to-end production pipeline for LA Agenda Alerts."""
     
+    # Sources are fetched concurrently; network I/O dominates wall time
+    MAX_CONCURRENT_SOURCES = 16
+    
     def __init__(self):
         self.project_dir = Path(__file__).parent.parent
         self.cache_dir = self.project_dir / "data" / "cache"
@@ -36,59 +52,69 @@ class ProductionPipeline:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.state_dir.mkdir(parents=True, exist_ok=True)
         
-        # Import production modules
-        from src.fetcher import ProductionFetcher
-        from src.parser import ProductionParser
-        from src.diff import ProductionDiff
-        
         self.fetcher = ProductionFetcher(self.cache_dir)
-        self.parser = ProductionParser()
+        self.parser = ProductionParser(self.cache_dir)
         self.differ = ProductionDiff(self.state_dir)
         
+        # Raw-bytes fingerprints from the last run: {source_id: {url: fingerprint}}
+        self.raw_fingerprints_file = self.state_dir / 'raw_fingerprints.json'
+        self.raw_fingerprints = self._load_raw_fingerprints()
+        
         self.results = {
-            'started_at': datetime.now().isoformat(),
+            'started_at': datetime.now(),
             'sources_checked': 0,
             'sources_failed': 0,
             'changes_detected': 0,
             'alerts_sent': 0,
             'errors': []
         }
+        self._results_lock = threading.Lock()
+        self._diff_lock = threading.Lock()
     
     def run(self):
         """Run complete pipeline."""
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("PRODUCTION PIPELINE STARTING")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         try:
             # Load sources
             sources = self._load_sources()
-            logger.info(f"Loaded {len(sources)} sources")
+            logger.info("Loaded %d sources", len(sources))
             
-            # Process each source
-            for source in sources:
-                try:
-                    self._process_source(source)
-                except Exception as e:
-                    logger.error(f"Failed to process {source['id']}: {e}")
-                    self.results['sources_failed'] += 1
-                    self.results['errors'].append(f"{source['id']}: {str(e)}")
+            # Process sources concurrently
+            workers = max(1, min(self.MAX_CONCURRENT_SOURCES, len(sources)))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(self._process_source, source): source for source in sources}
+                for future in concurrent.futures.as_completed(futures):
+                    source = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error("Failed to process %s: %s", source['id'], e)
+                        self._count('sources_failed')
+                        self.results['errors'].append(f"{source['id']}: {str(e)}")
             
             # Clean old cache
             self.fetcher.clean_old_cache(max_age_days=7)
+            self.parser.clean_old_cache(max_age_days=7)
+            self.parser.close()
             
             # Summary
-            self.results['ended_at'] = datetime.now().isoformat()
+            self.results['ended_at'] = datetime.now()
             self._log_summary()
             
             return 0 if self.results['sources_failed'] == 0 else 1
             
         except Exception as e:
-            logger.error(f"Pipeline failed: {e}")
+            logger.error("Pipeline failed: %s", e)
             return 1
     
     def _load_sources(self) -> list:
         """Load sources configuration."""
+        if orjson is not None:
+            with open(self.sources_file, 'rb') as f:
+                return orjson.loads(f.read()).get('sources', [])
         with open(self.sources_file) as f:
             return json.load(f).get('sources', [])
     
@@ -97,18 +123,28 @@ class ProductionPipeline:
         source_id = source['id']
         urls = source.get('urls', [])
         
-        logger.info(f"Processing {source_id}...")
-        self.results['sources_checked'] += 1
+        logger.info("Processing %s...", source_id)
+        self._count('sources_checked')
         
         # Fetch each URL for this source
-        all_texts = []
+        fetched = []
         for url in urls:
             content, metadata = self.fetcher.fetch(url, source_id)
             
             if content is None:
-                logger.warning(f"Failed to fetch {url}: {metadata.get('error')}")
+                logger.warning("Failed to fetch %s: %s", url, metadata.get('error'))
                 continue
             
+            fetched.append((url, content, metadata))
+        
+        # Skip parse/diff entirely when every URL returned the same bytes as last run
+        raw_fingerprints = {url: self._raw_fingerprint(content) for url, content, _ in fetched}
+        if fetched and len(fetched) == len(urls) and raw_fingerprints == self.raw_fingerprints.get(source_id):
+            logger.info("✅ No raw change in %s", source_id)
+            return
+        
+        all_texts = []
+        for url, content, metadata in fetched:
             # Parse content
             parsed = self.parser.parse(
                 content, 
@@ -118,71 +154,109 @@ class ProductionPipeline:
             )
             
             if not self.parser.is_valid_parse(parsed):
-                logger.warning(f"Low confidence parse for {source_id}: {parsed.confidence}")
+                logger.warning("Low confidence parse for %s: %s", source_id, parsed.confidence)
                 if parsed.parse_warnings:
-                    logger.warning(f"Warnings: {parsed.parse_warnings}")
+                    logger.warning("Warnings: %s", parsed.parse_warnings)
                 continue
             
             all_texts.append(parsed.text)
         
         if not all_texts:
-            logger.error(f"No valid content from {source_id}")
-            self.results['sources_failed'] += 1
+            logger.error("No valid content from %s", source_id)
+            self._count('sources_failed')
             return
         
-        # Combine all texts from this source
-        combined_text = "\n\n".join(all_texts)
-        combined_fingerprint = self._fingerprint(combined_text)
+        # Fingerprint all texts from this source as one document; the differ
+        # only joins them if the fingerprint changed
+        combined_fingerprint = self._fingerprint(all_texts)
         
-        # Check for changes
-        change_summary = self.differ.compare(source_id, combined_text, combined_fingerprint)
+        # Check for changes (differ state is shared across worker threads)
+        with self._diff_lock:
+            change_summary = self.differ.compare(source_id, all_texts, combined_fingerprint)
+            self.raw_fingerprints[source_id] = raw_fingerprints
+            self._save_raw_fingerprints()
         
         if change_summary.changed:
-            logger.info(f"🚨 CHANGE DETECTED in {source_id}!")
-            logger.info(f"   Added: {len(change_summary.added_lines)} lines")
-            logger.info(f"   Removed: {len(change_summary.removed_lines)} lines")
-            logger.info(f"   Changed: {change_summary.percent_changed:.1f}%")
+            logger.info("🚨 CHANGE DETECTED in %s!", source_id)
+            logger.info("   Added: %d lines", len(change_summary.added_lines))
+            logger.info("   Removed: %d lines", len(change_summary.removed_lines))
+            logger.info("   Changed: %.1f%%", change_summary.percent_changed)
             
-            self.results['changes_detected'] += 1
+            self._count('changes_detected')
             
             # TODO: Match and notify
             # self._match_and_notify(source, change_summary)
         else:
-            logger.info(f"✅ No meaningful change in {source_id}")
+            logger.info("✅ No meaningful change in %s", source_id)
+    
+    def _count(self, key: str):
+        """Increment a run counter from any worker thread."""
+        with self._results_lock:
+            self.results[key] += 1
+    
+    def _load_raw_fingerprints(self) -> dict:
+        """
+        Load raw-bytes fingerprints from the last run.
+        
+        They are dropped if they were made by another hash algorithm (or
+        predate the algorithm tag); the next run then just re-parses.
+        """
+        if self.raw_fingerprints_file.exists():
+            try:
+                with open(self.raw_fingerprints_file) as f:
+                    data = json.load(f)
+                if data.get('algorithm') == FINGERPRINT_ALGORITHM:
+                    return data.get('sources', {})
+                logger.info("Raw fingerprints use another hash algorithm, ignoring them")
+            except Exception as e:
+                logger.warning("Could not read raw fingerprints: %s", e)
+        return {}
+    
+    def _save_raw_fingerprints(self):
+        """Save raw-bytes fingerprints to disk, tagged with their hash algorithm."""
+        with open(self.raw_fingerprints_file, 'w') as f:
+            json.dump({'algorithm': FINGERPRINT_ALGORITHM, 'sources': self.raw_fingerprints}, f, indent=2)
     
-    def _fingerprint(self, text: str) -> str:
-        """Generate fingerprint for text."""
-        import hashlib
-        return hashlib.sha256(text.encode()).hexdigest()[:16]
+    def _raw_fingerprint(self, content: bytes) -> str:
+        """Cheap fingerprint of fetched bytes, checked before parsing."""
+        return content_fingerprint(content)
+    
+    def _fingerprint(self, texts: list) -> str:
+        """Generate fingerprint for texts joined by blank lines."""
+        return content_fingerprint_many(texts)
     
     def _log_summary(self):
         """Log pipeline summary."""
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("PIPELINE SUMMARY")
-        logger.info("=" * 60)
-        logger.info(f"Sources checked: {self.results['sources_checked']}")
-        logger.info(f"Sources failed: {self.results['sources_failed']}")
-        logger.info(f"Changes detected: {self.results['changes_detected']}")
-        logger.info(f"Alerts sent: {self.results['alerts_sent']}")
+        logger.info(_BANNER)
+        logger.info("Sources checked: %d", self.results['sources_checked'])
+        logger.info("Sources failed: %d", self.results['sources_failed'])
+        logger.info("Changes detected: %d", self.results['changes_detected'])
+        logger.info("Alerts sent: %d", self.results['alerts_sent'])
         
         if self.results['errors']:
-            logger.info(f"Errors: {len(self.results['errors'])}")
+            logger.info("Errors: %d", len(self.results['errors']))
             for error in self.results['errors'][:5]:
-                logger.info(f"  - {error}")
+                logger.info("  - %s", error)
         
         # Single-line summary for cron
-        summary_line = (
-            f"PIPELINE_COMPLETE: checked={self.results['sources_checked']} "
-            f"failed={self.results['sources_failed']} "
-            f"changes={self.results['changes_detected']} "
-            f"alerts={self.results['alerts_sent']}"
+        logger.info(
+            "PIPELINE_COMPLETE: checked=%d failed=%d changes=%d alerts=%d",
+            self.results['sources_checked'],
+            self.results['sources_failed'],
+            self.results['changes_detected'],
+            self.results['alerts_sent']
         )
-        logger.info(summary_line)
         
-        # Save results
+        # Save results (datetimes serialize as ISO 8601)
         results_file = self.state_dir / 'last_run.json'
-        with open(results_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        if orjson is not None:
+            with open(results_file, 'wb') as f:
+                f.write(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(self.results, f, indent=2, default=datetime.isoformat)
 
 
 if __name__ == '__main__':
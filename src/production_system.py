@@ -3,14 +3,19 @@
 Production-Ready Agenda Discovery with Recursive Navigation
 """
 
-import gzip
+import functools
 import hashlib
+import heapq
 import io
+import json
 import logging
 import random
 import re
+import sqlite3
 import ssl
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -19,7 +24,58 @@ from urllib.parse import urljoin, urlparse
 import urllib.request
 import urllib.error
 
-# PDF imports
+# zlib-ng's gzip module is a drop-in replacement with a faster inflate
+try:
+    from zlib_ng import gzip_ng as gzip
+except ImportError:
+    import gzip
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Pooled HTTP (keep-alive + retries) when requests is installed
+try:
+    import requests
+    import urllib3
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+except ImportError:
+    requests = None
+
+if requests is not None:
+    class _SharedTLSAdapter(HTTPAdapter):
+        """HTTPAdapter whose connection pools all use one prebuilt SSL context."""
+        
+        def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+            self._ssl_context = ssl_context
+            super().__init__(**kwargs)
+        
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['ssl_context'] = self._ssl_context
+            return super().init_poolmanager(*args, **kwargs)
+
+# C-level HTML parsing when selectolax is installed (regex fallback otherwise)
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    SelectolaxHTMLParser = None
+
+# Single-pass multi-phrase matching for DocumentClassifier
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# PDF imports (PDFium first: C++ backend, much faster than pdfminer/PyPDF2)
+try:
+    import pypdfium2
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
 try:
     import pdfplumber
     PDFPLUMBER_AVAILABLE = True
@@ -34,6 +90,54 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns (link scoring and fact extraction run per link / per line)
+_WS_RE = re.compile(r'\s+')
+_TAG_RE = re.compile(r'<[^>]+>')
+# Host of an absolute or protocol-relative href (no match means relative)
+_HREF_HOST_RE = re.compile(r'^(?:[A-Za-z][A-Za-z0-9+.-]*:)?//([^/?#]*)')
+_LINK_RE = re.compile(r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>(.*?)</a>', re.DOTALL | re.IGNORECASE)
+_SCRIPT_STYLE_RE = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_MAIN_CONTENT_SELECTORS = ('main', 'article', 'div[class*="content"]', 'div[class*="main"]')
+_MAIN_CONTENT_RES = [re.compile(pattern, re.DOTALL | re.IGNORECASE) for pattern in (
+    r'<main[^>]*>(.*?)</main>',
+    r'<article[^>]*>(.*?)</article>',
+    r'<div[^>]*class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>',
+    r'<div[^>]*class=["\'][^"\']*main[^"\']*["\'][^>]*>(.*?)</div>',
+)]
+
+# _normalize_text noise removal
+# Page numbers and printed/updated/generated timestamps, removed in one pass
+_NOISE_DROP_RE = re.compile(
+    r'\b[Pp]age\s+\d+\s+(?:of|/)\s+\d+\b'
+    r'|\b[Pp]age\s+\d+\b'
+    r'|\b[Pp]rinted\s+(?:on|at)\s+[^\n]+'
+    r'|\b[Uu]pdated\s+(?:on|at)?\s*[^\n]+'
+    r'|\b[Gg]enerated\s+(?:on|at)?\s*[^\n]+'
+)
+_BLANKLINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_SPACES_RE = re.compile(r'[ \t]+')
+
+# extract_meeting_facts
+# Any supported date form (full or abbreviated month name, m/d/yyyy, m-d-yyyy)
+_DATE_RE = re.compile(
+    r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}'
+    r'|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4}',
+    re.IGNORECASE
+)
+_TIME_RE = re.compile(r'\d{1,2}:\d{2}\s*(AM|PM|am|pm|a\.m\.|p\.m\.)', re.IGNORECASE)
+_COMMITTEE_RE = re.compile(
+    r'board\s+of\s+\w+|city\s+council|planning\s+commission|committee\s+on\s+\w+|metro\s+board',
+    re.IGNORECASE
+)
+_ITEM_START_RE = re.compile(r'^(?:\d+[\.\)]|[•\-\*])\s+')
+_ITEM_PREFIX_RE = re.compile(r'^[\d•\-\*\.\)]+\s*')
+
+
+@functools.lru_cache(maxsize=4096)
+def _url_key(url: str) -> str:
+    """Cache file stem for a URL (discovery revisits the same links often)."""
+    return hashlib.sha256(url.encode()).hexdigest()
+
 
 @dataclass
 class ParsedDoc:
@@ -56,7 +160,7 @@ class ParsedDoc:
     @staticmethod
     def _normalize_for_fingerprint(text: str) -> str:
         lines = text.lower().split('\n')
-        lines = [re.sub(r'\s+', ' ', line).strip() for line in lines]
+        lines = [_WS_RE.sub(' ', line).strip() for line in lines]
         lines = sorted([l for l in lines if len(l) > 3])
         return '\n'.join(lines)
 
@@ -64,12 +168,19 @@ class ParsedDoc:
 class ProductionFetcher:
     """Production-grade fetcher with rate limiting and resilience."""
     
+    POOL_SIZE = 16
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
     def __init__(self, cache_dir: Path, timeout: int = 30, bypass_cache: bool = False):
         self.cache_dir = cache_dir
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.timeout = timeout
         self.bypass_cache = bypass_cache
         
+        # One SQLite store for all cached responses (shared by discovery threads)
+        self._db = self._open_cache_db()
+        self._db_lock = threading.Lock()
+        
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -85,8 +196,43 @@ class ProductionFetcher:
         self.ssl_context.verify_mode = ssl.CERT_NONE
         
         self.last_fetch: Dict[str, float] = {}
+        self._rate_lock = threading.Lock()
         self.min_delay = 2.0
         
+        self.session = self._create_session() if requests is not None else None
+    
+    def _create_session(self):
+        """
+        Session reusing TCP/TLS connections per host, retrying 429/5xx with
+        backoff. Every pool shares self.ssl_context instead of building its own.
+        """
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.verify = False
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=self.RETRY_STATUSES,
+                      raise_on_status=False)
+        adapter = _SharedTLSAdapter(self.ssl_context, pool_connections=self.POOL_SIZE,
+                                    pool_maxsize=self.POOL_SIZE, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _open_cache_db(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.cache_dir / 'cache.sqlite', isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                url_hash TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                encoding TEXT,
+                cached_at TEXT NOT NULL,
+                meta TEXT NOT NULL
+            )
+        """)
+        return conn
+        
     def fetch(self, url: str, source_id: str) -> Tuple[Optional[bytes], Dict]:
         domain = urlparse(url).netloc
         metadata = {
@@ -102,10 +248,12 @@ class ProductionFetcher:
             'cache_bypassed': self.bypass_cache
         }
         
+        cache_key = _url_key(url)
+        
         if self.bypass_cache:
             logger.info(f"Cache bypassed for {source_id}")
         else:
-            cached = self._get_cached(url)
+            cached = self._get_cached(cache_key)
             if cached and self._is_cache_fresh(cached, hours=1):
                 metadata['cached'] = True
                 metadata['sha256'] = cached['sha256']
@@ -113,22 +261,53 @@ class ProductionFetcher:
         
         self._rate_limit(domain)
         
+        if self.session is not None:
+            content = self._fetch_pooled(url, metadata)
+        else:
+            content = self._fetch_with_retries(url, metadata)
+        
+        if content is not None:
+            metadata['sha256'] = hashlib.sha256(content).hexdigest()
+            if not self.bypass_cache:
+                self._cache_content(cache_key, content, metadata)
+            return content, metadata
+        
+        return None, metadata
+    
+    def _fetch_pooled(self, url: str, metadata: Dict) -> Optional[bytes]:
+        """Fetch through the pooled session; retries happen inside the adapter."""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            metadata['error'] = str(e)
+            return None
+        
+        metadata['status_code'] = response.status_code
+        metadata['content_type'] = response.headers.get('Content-Type', 'unknown')
+        metadata['gzip_detected'] = response.headers.get('Content-Encoding', '').lower() == 'gzip'
+        
+        if response.status_code >= 400:
+            metadata['error'] = f'HTTP {response.status_code}'
+            return None
+        
+        # requests has already undone any Content-Encoding
+        return response.content
+    
+    def _fetch_with_retries(self, url: str, metadata: Dict) -> Optional[bytes]:
+        """urllib fallback with manual retry/backoff on 429 and 5xx."""
         for attempt in range(3):
             try:
                 content, response_meta = self._fetch_once(url)
                 metadata.update(response_meta)
                 
                 if content is not None:
-                    metadata['sha256'] = hashlib.sha256(content).hexdigest()
-                    if not self.bypass_cache:
-                        self._cache_content(url, content, metadata)
-                    return content, metadata
+                    return content
                     
             except urllib.error.HTTPError as e:
                 metadata['status_code'] = e.code
                 if e.code in (404, 410):
                     metadata['error'] = f'HTTP {e.code}'
-                    return None, metadata
+                    return None
                 elif e.code == 429:
                     time.sleep(self._exponential_backoff(attempt))
                     continue
@@ -137,12 +316,12 @@ class ProductionFetcher:
                     continue
                 else:
                     metadata['error'] = f'HTTP {e.code}'
-                    return None, metadata
+                    return None
             except Exception as e:
                 metadata['error'] = str(e)
                 time.sleep(self._exponential_backoff(attempt))
         
-        return None, metadata
+        return None
     
     def _fetch_once(self, url: str) -> Tuple[Optional[bytes], Dict]:
         request = urllib.request.Request(url, headers=self.headers)
@@ -167,59 +346,100 @@ class ProductionFetcher:
         return content, meta
     
     def _rate_limit(self, domain: str):
-        now = time.time()
-        if domain in self.last_fetch:
-            elapsed = now - self.last_fetch[domain]
-            if elapsed < self.min_delay:
-                time.sleep(self.min_delay - elapsed)
-        self.last_fetch[domain] = now
+        # Reserve the next slot under the lock, then sleep outside it
+        with self._rate_lock:
+            now = time.time()
+            sleep_time = 0.0
+            if domain in self.last_fetch:
+                elapsed = now - self.last_fetch[domain]
+                if elapsed < self.min_delay:
+                    sleep_time = self.min_delay - elapsed
+            self.last_fetch[domain] = now + sleep_time
+        
+        if sleep_time > 0:
+            time.sleep(sleep_time)
     
     def _exponential_backoff(self, attempt: int) -> float:
         return min(2 ** attempt, 60) + random.uniform(0, 1)
     
-    def _get_cached(self, url: str) -> Optional[Dict]:
+    def _get_cached(self, cache_key: str) -> Optional[Dict]:
+        """Load a cached response (metadata plus raw content) from the SQLite store."""
         if self.bypass_cache:
             return None
-        cache_file = self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
-        if cache_file.exists():
-            import json
-            with open(cache_file) as f:
-                return json.load(f)
-        return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT content, encoding, cached_at, meta FROM cache WHERE url_hash = ?",
+                    (cache_key,)
+                ).fetchone()
+            if row is None:
+                return None
+            content, encoding, cached_at, meta = row
+            cached = orjson.loads(meta) if orjson is not None else json.loads(meta)
+            cached['cached_at'] = cached_at
+            cached['content'] = gzip.decompress(content) if encoding == 'gzip' else content
+            return cached
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+            return None
     
-    def _cache_content(self, url: str, content: bytes, metadata: Dict):
+    def _cache_content(self, cache_key: str, content: bytes, metadata: Dict):
+        """Store raw content (HTML gzipped at level 1) and metadata in one row."""
         if self.bypass_cache:
             return
-        cache_file = self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
-        import json
-        with open(cache_file, 'w') as f:
-            json.dump({'content': content.hex(), 'sha256': metadata['sha256'], 
-                      'cached_at': datetime.now().isoformat(), **metadata}, f)
+        compress = 'html' in (metadata.get('content_type') or '').lower()
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (url_hash, content, encoding, cached_at, meta) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (cache_key,
+                     gzip.compress(content, compresslevel=1) if compress else content,
+                     'gzip' if compress else None,
+                     datetime.now().isoformat(),
+                     orjson.dumps(metadata).decode() if orjson is not None else json.dumps(metadata))
+                )
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
     
     def _is_cache_fresh(self, cached: Dict, hours: int = 1) -> bool:
         cached_time = datetime.fromisoformat(cached.get('cached_at', '2000-01-01'))
         return (datetime.now() - cached_time).total_seconds() < hours * 3600
 
 
+# DocumentClassifier indicator phrases by category
+_CLASSIFIER_INDICATORS = (
+    ('agenda', ('agenda', 'agenda item', 'order of business', 'call to order',
+                'item no', 'item #', 'resolution no', 'motion')),
+    ('calendar', ('calendar', 'meeting calendar', 'schedule of meetings')),
+    ('minutes', ('minutes', 'meeting minutes', 'approved minutes')),
+)
+
+
+def _build_indicator_automaton():
+    """Aho-Corasick automaton over all indicator phrases, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for category, phrases in _CLASSIFIER_INDICATORS:
+        for phrase in phrases:
+            automaton.add_word(phrase, category)
+    automaton.make_automaton()
+    return automaton
+
+
+_INDICATOR_AUTOMATON = _build_indicator_automaton()
+
+
 class DocumentClassifier:
     """Classifies documents as agenda, calendar, minutes, or index."""
     
     @staticmethod
     def classify(text: str) -> str:
-        text_lower = text.lower()[:2000]  # Check first 2000 chars
-        
-        # Agenda indicators
-        agenda_indicators = ['agenda', 'agenda item', 'order of business', 'call to order',
-                           'item no', 'item #', 'resolution no', 'motion']
-        has_agenda = any(ind in text_lower for ind in agenda_indicators)
-        
-        # Calendar indicators
-        calendar_indicators = ['calendar', 'meeting calendar', 'schedule of meetings']
-        has_calendar = any(ind in text_lower for ind in calendar_indicators)
-        
-        # Minutes indicators
-        minutes_indicators = ['minutes', 'meeting minutes', 'approved minutes']
-        has_minutes = any(ind in text_lower for ind in minutes_indicators)
+        hits = DocumentClassifier._indicator_hits(text[:2000].lower())  # Check first 2000 chars
+        has_agenda = 'agenda' in hits
+        has_calendar = 'calendar' in hits
+        has_minutes = 'minutes' in hits
         
         # Classification logic
         if has_agenda and not has_calendar:
@@ -232,6 +452,18 @@ class DocumentClassifier:
             return 'index'  # Likely an index/events page
         else:
             return 'unknown'
+    
+    @staticmethod
+    def _indicator_hits(text_lower: str) -> set:
+        """Categories with at least one indicator phrase in the text."""
+        if _INDICATOR_AUTOMATON is not None:
+            return {category for _, category in _INDICATOR_AUTOMATON.iter(text_lower)}
+        return {category for category, phrases in _CLASSIFIER_INDICATORS
+                if any(phrase in text_lower for phrase in phrases)}
+
+
+def _link_score(link: Dict) -> int:
+    return link['score']
 
 
 class RecursiveAgendaDiscovery:
@@ -243,12 +475,28 @@ class RecursiveAgendaDiscovery:
                         'login', 'search', 'newsletter', 'rss', 'feed']
     DATE_PATTERNS = [r'\d{4}', r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*',
                      r'\d{1,2}/\d{1,2}', r'\d{1,2}-\d{1,2}']
+    _DATE_SCORE_RE = re.compile('|'.join(DATE_PATTERNS), re.IGNORECASE)
+    # Substring semantics (hrefs like '/boardmeeting2024' must still match)
+    _POSITIVE_RE = re.compile('|'.join(kw for kw in POSITIVE_KEYWORDS if kw != 'agenda'))
+    _NEGATIVE_RE = re.compile('|'.join(NEGATIVE_KEYWORDS))
+    # Most the date and same-domain checks can add
+    _LATE_BONUS_MAX = 12 + 8
+    
+    # Top-scoring links tried at each depth when the best one is a dead end
+    MAX_CANDIDATES = 6
+    # Links kept per page (covers the candidates and the reported top links)
+    TOP_LINKS = 8
+    # Lines extract_meeting_facts looks at; PDF extraction can stop once an
+    # agenda has this many
+    FACT_SCAN_LINES = 300
     
     def __init__(self, fetcher: ProductionFetcher):
         self.fetcher = fetcher
         self.classifier = DocumentClassifier()
     
-    def score_link(self, href: str, anchor_text: str, base_url: str) -> int:
+    def score_link(self, href: str, anchor_text: str, base_url: str, base_domain: Optional[str] = None) -> int:
+        if base_domain is None:
+            base_domain = urlparse(base_url).netloc
         score = 0
         href_lower = href.lower()
         text_lower = anchor_text.lower()
@@ -271,45 +519,58 @@ class RecursiveAgendaDiscovery:
             else:
                 score += 10
         
-        for keyword in self.POSITIVE_KEYWORDS:
-            if keyword in combined and keyword != 'agenda':
-                score += 10
-                break
+        if self._POSITIVE_RE.search(combined):
+            score += 10
         
-        for pattern in self.DATE_PATTERNS:
-            if re.search(pattern, combined, re.IGNORECASE):
-                score += 12
-                break
+        if self._NEGATIVE_RE.search(combined):
+            score -= 10
         
-        base_domain = urlparse(base_url).netloc
-        link_domain = urlparse(urljoin(base_url, href)).netloc
-        if base_domain == link_domain or not link_domain:
-            score += 8
+        # Navigation chrome that can't reach a positive score skips the costlier checks
+        if score + self._LATE_BONUS_MAX <= 0:
+            return score
         
-        for keyword in self.NEGATIVE_KEYWORDS:
-            if keyword in combined:
-                score -= 10
-                break
+        if self._DATE_SCORE_RE.search(combined):
+            score += 12
+        
+        host = _HREF_HOST_RE.match(href)
+        if host is None or not host.group(1) or host.group(1) == base_domain:
+            score += 8
         
         return score
     
-    def extract_links(self, html: str, base_url: str) -> List[Dict]:
+    def extract_links(self, html: str, base_url: str, tree=None) -> List[Dict]:
+        """Scored links on a page, best first; pass a selectolax tree to reuse an existing parse."""
+        links = self._score_links(html, base_url, tree)
+        links.sort(key=_link_score, reverse=True)
+        return links
+    
+    def _score_links(self, html: str, base_url: str, tree=None) -> List[Dict]:
+        """Scored links in page order."""
         links = []
-        pattern = r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>(.*?)</a>'
-        matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        for href, anchor_html in matches:
-            anchor_text = re.sub(r'<[^>]+>', ' ', anchor_html).strip()
-            anchor_text = re.sub(r'\s+', ' ', anchor_text)
+        base_domain = urlparse(base_url).netloc
+        for href, anchor_text in self._iter_anchors(html, tree):
             absolute_url = urljoin(base_url, href)
-            score = self.score_link(href, anchor_text, base_url)
+            score = self.score_link(href, anchor_text, base_url, base_domain)
             
             links.append({'url': absolute_url, 'href': href, 
                          'anchor_text': anchor_text[:100], 'score': score})
         
-        links.sort(key=lambda x: x['score'], reverse=True)
         return links
     
+    def _iter_anchors(self, html: str, tree=None):
+        """Yield (href, anchor text) for every <a href> on the page."""
+        if SelectolaxHTMLParser is None:
+            for href, anchor_html in _LINK_RE.findall(html):
+                yield href, _WS_RE.sub(' ', _TAG_RE.sub(' ', anchor_html).strip())
+            return
+        
+        if tree is None:
+            tree = SelectolaxHTMLParser(html)
+        for node in tree.css('a[href]'):
+            href = node.attributes.get('href')
+            if href:
+                yield href, _WS_RE.sub(' ', node.text(separator=' ')).strip()
+    
     def discover_agenda(self, landing_url: str, source_id: str, max_depth: int = 2) -> Dict:
         """
         Recursively discover agenda document.
@@ -327,24 +588,27 @@ class RecursiveAgendaDiscovery:
         }
         
         current_url = landing_url
+        prefetched = None
         
         for depth in range(max_depth + 1):
             result['depth_used'] = depth
             
-            # Fetch current page
-            content, metadata = self.fetcher.fetch(current_url, f"{source_id}_d{depth}")
+            # Fetch current page (unless it was fetched with the previous level's candidates)
+            if prefetched is not None:
+                content, metadata = prefetched
+                prefetched = None
+            else:
+                content, metadata = self.fetcher.fetch(current_url, f"{source_id}_d{depth}")
             
             if not content or metadata.get('status_code') != 200:
                 result['error'] = f"Failed to fetch at depth {depth}: {metadata.get('error')}"
                 return result
             
             # Try to parse as document
-            is_pdf = current_url.lower().endswith('.pdf') or 'pdf' in metadata.get('content_type', '')
-            
-            if is_pdf:
+            if self._is_pdf(current_url, metadata):
                 # Parse PDF
                 parsed = self._parse_pdf(content, current_url)
-                doc_type = self.classifier.classify(parsed.text)
+                doc_type = parsed.doc_type
                 
                 step = {
                     'depth': depth,
@@ -368,7 +632,10 @@ class RecursiveAgendaDiscovery:
             else:
                 # HTML page - extract links and continue
                 html = content.decode('utf-8', errors='ignore')
-                links = self.extract_links(html, current_url)
+                tree = SelectolaxHTMLParser(html) if SelectolaxHTMLParser is not None else None
+                # Only the best few links are ever used; skip sorting the rest
+                all_links = self._score_links(html, current_url, tree)
+                links = heapq.nlargest(self.TOP_LINKS, all_links, key=_link_score)
                 
                 if not links:
                     result['error'] = f"No links found at depth {depth}"
@@ -376,16 +643,17 @@ class RecursiveAgendaDiscovery:
                 
                 # Score the page itself
                 page_score = 0
-                if 'agenda' in html.lower():
+                html_lower = html.lower()
+                if 'agenda' in html_lower:
                     page_score += 20
-                if any(x in html.lower() for x in ['packet', 'materials']):
+                if 'packet' in html_lower or 'materials' in html_lower:
                     page_score += 15
                 
                 step = {
                     'depth': depth,
                     'url': current_url,
                     'type': 'HTML',
-                    'links_found': len(links),
+                    'links_found': len(all_links),
                     'top_links': links[:5],
                     'page_score': page_score
                 }
@@ -393,8 +661,8 @@ class RecursiveAgendaDiscovery:
                 
                 # Check if this HTML page IS the agenda (rare but possible)
                 if page_score >= 25:
-                    parsed = self._parse_html(content, current_url)
-                    doc_type = self.classifier.classify(parsed.text)
+                    parsed = self._parse_html(content, current_url, tree)
+                    doc_type = parsed.doc_type
                     if doc_type == 'agenda':
                         result['final_url'] = current_url
                         result['final_content'] = content
@@ -404,17 +672,36 @@ class RecursiveAgendaDiscovery:
                 
                 # Select best link for next depth
                 if depth < max_depth:
-                    best_link = None
-                    for link in links:
-                        if link['score'] > 0:
-                            best_link = link
-                            break
-                    
-                    if best_link:
-                        current_url = best_link['url']
-                    else:
+                    candidates = [link for link in links[:self.MAX_CANDIDATES] if link['score'] > 0]
+                    if not candidates:
                         result['error'] = f"No positive-scoring links at depth {depth}"
                         return result
+                    
+                    # Follow the top link, as before; only if it is a dead end are the
+                    # others tried. If none works, the top link's failure is reported.
+                    top = self._fetch_candidate(candidates[0], source_id, depth + 1, 0)
+                    if not self._is_usable(top):
+                        top = self._first_usable(candidates[1:], source_id, depth + 1) or top
+                    link, link_content, link_metadata, parsed = top
+                    
+                    # An agenda PDF ends the search here instead of being re-parsed
+                    if parsed is not None and parsed.doc_type == 'agenda':
+                        result['depth_used'] = depth + 1
+                        result['discovery_path'].append({
+                            'depth': depth + 1,
+                            'url': link['url'],
+                            'type': 'PDF',
+                            'doc_type': parsed.doc_type,
+                            'score': 100
+                        })
+                        result['final_url'] = link['url']
+                        result['final_content'] = link_content
+                        result['final_metadata'] = link_metadata
+                        result['final_parsed'] = parsed
+                        return result
+                    
+                    current_url = link['url']
+                    prefetched = (link_content, link_metadata)
                 else:
                     # At max depth, return best available
                     if links:
@@ -432,21 +719,76 @@ class RecursiveAgendaDiscovery:
         
         return result
     
+    def _fetch_candidate(self, link: Dict, source_id: str, depth: int, index: int) -> Tuple[Dict, Optional[bytes], Dict, Optional[ParsedDoc]]:
+        """Fetch a candidate link; PDFs that came back are parsed as well."""
+        content, metadata = self.fetcher.fetch(link['url'], f"{source_id}_d{depth}_{index}")
+        parsed = None
+        if content and metadata.get('status_code') == 200 and self._is_pdf(link['url'], metadata):
+            parsed = self._parse_pdf(content, link['url'])
+        return link, content, metadata, parsed
+    
+    @staticmethod
+    def _is_usable(candidate: Tuple[Dict, Optional[bytes], Dict, Optional[ParsedDoc]]) -> bool:
+        """A fetched HTML page, or a PDF that is an agenda."""
+        _, content, metadata, parsed = candidate
+        if not content or metadata.get('status_code') != 200:
+            return False
+        return parsed is None or parsed.doc_type == 'agenda'
+    
+    def _first_usable(self, links: List[Dict], source_id: str, depth: int):
+        """
+        Best-scoring usable candidate among links, or None.
+        
+        Different hosts are tried concurrently, but each host's links one at a
+        time in score order, stopping at the first usable one. The fetcher
+        spaces same-host requests min_delay apart, so fetching them "in
+        parallel" would only queue them behind each other.
+        """
+        by_host = {}
+        for index, link in enumerate(links, 1):
+            by_host.setdefault(urlparse(link['url']).netloc, []).append((index, link))
+        if not by_host:
+            return None
+        
+        def walk(host_links):
+            for index, link in host_links:
+                candidate = self._fetch_candidate(link, source_id, depth, index)
+                if self._is_usable(candidate):
+                    return index, candidate
+            return None
+        
+        with ThreadPoolExecutor(max_workers=len(by_host)) as pool:
+            found = [hit for hit in pool.map(walk, by_host.values()) if hit is not None]
+        return min(found, key=lambda hit: hit[0])[1] if found else None
+    
+    @staticmethod
+    def _is_pdf(url: str, metadata: Dict) -> bool:
+        return url.lower().endswith('.pdf') or 'pdf' in (metadata.get('content_type') or '')
+    
     def _parse_pdf(self, content: bytes, url: str) -> ParsedDoc:
         warnings = []
         text = ""
         page_count = 0
+        stopped_early = False
+        
+        if PDFIUM_AVAILABLE:
+            try:
+                pdf = pypdfium2.PdfDocument(content)
+                try:
+                    page_count = len(pdf)
+                    text, stopped_early = self._collect_pages(
+                        page.get_textpage().get_text_range() for page in pdf
+                    )
+                finally:
+                    pdf.close()
+            except Exception as e:
+                warnings.append(f"pdfium_error: {e}")
         
-        if PDFPLUMBER_AVAILABLE:
+        if not text and PDFPLUMBER_AVAILABLE:
             try:
                 with pdfplumber.open(io.BytesIO(content)) as pdf:
                     page_count = len(pdf.pages)
-                    pages_text = []
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            pages_text.append(page_text)
-                    text = '\n\n'.join(pages_text)
+                    text, stopped_early = self._collect_pages(page.extract_text() for page in pdf.pages)
             except Exception as e:
                 warnings.append(f"pdfplumber_error: {e}")
         
@@ -454,15 +796,13 @@ class RecursiveAgendaDiscovery:
             try:
                 reader = PyPDF2.PdfReader(io.BytesIO(content))
                 page_count = len(reader.pages)
-                pages_text = []
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        pages_text.append(page_text)
-                text = '\n\n'.join(pages_text)
+                text, stopped_early = self._collect_pages(page.extract_text() for page in reader.pages)
             except Exception as e:
                 warnings.append(f"pypdf2_error: {e}")
         
+        if stopped_early:
+            warnings.append("stopped_after_classification")
+        
         text = self._normalize_text(text)
         doc_type = self.classifier.classify(text)
         
@@ -475,20 +815,51 @@ class RecursiveAgendaDiscovery:
             doc_type=doc_type
         )
     
-    def _parse_html(self, content: bytes, url: str) -> ParsedDoc:
+    def _collect_pages(self, page_texts) -> Tuple[str, bool]:
+        """
+        Join extracted page texts, stopping early once the text is classified
+        as an agenda and already covers the lines fact extraction reads.
+        Returns (text, stopped_early).
+        """
+        pages_text = []
+        line_count = 0
+        checked = False
+        
+        for page_text in page_texts:
+            if not page_text:
+                continue
+            pages_text.append(page_text)
+            line_count += page_text.count('\n') + 1
+            
+            if not checked and line_count >= self.FACT_SCAN_LINES:
+                text = '\n\n'.join(pages_text)
+                normalized = self._normalize_text(text)
+                if normalized.count('\n') >= self.FACT_SCAN_LINES:
+                    # Classification only reads the first 2000 chars, so it is final now
+                    checked = True
+                    if self.classifier.classify(normalized) == 'agenda':
+                        return text, True
+        
+        return '\n\n'.join(pages_text), False
+    
+    def _parse_html(self, content: bytes, url: str, tree=None) -> ParsedDoc:
         try:
             text = content.decode('utf-8', errors='replace')
         except:
             text = content.decode('latin-1', errors='replace')
         
-        text = re.sub(r'<script[^>]*>.*?</script>', ' ', text, flags=re.DOTALL | re.IGNORECASE)
-        text = re.sub(r'<style[^>]*>.*?</style>', ' ', text, flags=re.DOTALL | re.IGNORECASE)
-        
-        main_content = self._extract_main_content(text)
-        if main_content:
-            text = main_content
+        if SelectolaxHTMLParser is not None:
+            text = self._tree_text(tree if tree is not None else SelectolaxHTMLParser(text))
         else:
-            text = re.sub(r'<[^>]+>', ' ', text)
+            # Tags must survive until the main-content search, so this is
+            # one pass for script/style and (at most) one for the tags
+            text = _SCRIPT_STYLE_RE.sub(' ', text)
+            
+            main_content = self._extract_main_content(text)
+            if main_content:
+                text = main_content
+            else:
+                text = _TAG_RE.sub(' ', text)
         
         text = self._normalize_text(text)
         doc_type = self.classifier.classify(text)
@@ -502,38 +873,40 @@ class RecursiveAgendaDiscovery:
         )
     
     def _extract_main_content(self, html: str) -> Optional[str]:
-        patterns = [
-            r'<main[^>]*>(.*?)</main>',
-            r'<article[^>]*>(.*?)</article>',
-            r'<div[^>]*class=["\'][^"\']*content[^"\']*["\'][^>]*>(.*?)</div>',
-            r'<div[^>]*class=["\'][^"\']*main[^"\']*["\'][^>]*>(.*?)</div>',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html, re.DOTALL | re.IGNORECASE)
+        for pattern in _MAIN_CONTENT_RES:
+            matches = pattern.findall(html)
             if matches:
                 largest = max(matches, key=len)
                 if len(largest) > 500:
-                    return re.sub(r'<[^>]+>', ' ', largest)
+                    return _TAG_RE.sub(' ', largest)
         
         return None
     
+    def _tree_text(self, tree) -> str:
+        """Main-content (or whole-page) text from a selectolax tree, minus script/style."""
+        for node in tree.css('script, style'):
+            node.decompose()
+        
+        for selector in _MAIN_CONTENT_SELECTORS:
+            nodes = tree.css(selector)
+            if nodes:
+                largest = max((node.text(separator=' ') for node in nodes), key=len)
+                if len(largest) > 500:
+                    return largest
+        
+        root = tree.body if tree.body is not None else tree.root
+        return root.text(separator=' ') if root is not None else ''
+    
     def _normalize_text(self, text: str) -> str:
         if not text:
             return ""
         
-        # Remove page numbers
-        text = re.sub(r'\b[Pp]age\s+\d+\s+(of|/)\s+\d+\b', '', text)
-        text = re.sub(r'\b[Pp]age\s+\d+\b', '', text)
-        
-        # Remove timestamps
-        text = re.sub(r'\b[Pp]rinted\s+(on|at)\s+[^\n]+', '', text)
-        text = re.sub(r'\b[Uu]pdated\s+(on|at)?\s*[^\n]+', '', text)
-        text = re.sub(r'\b[Gg]enerated\s+(on|at)?\s*[^\n]+', '', text)
+        # Remove page numbers and timestamps
+        text = _NOISE_DROP_RE.sub('', text)
         
         # Collapse whitespace
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r'[ \t]+', ' ', text)
+        text = _BLANKLINES_RE.sub('\n\n', text)
+        text = _SPACES_RE.sub(' ', text)
         
         return text.strip()
     
@@ -549,23 +922,6 @@ class RecursiveAgendaDiscovery:
             'agenda_items': []
         }
         
-        date_patterns = [
-            (r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}', 'month_day_year'),
-            (r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{1,2},?\s+\d{4}', 'abbrev_month'),
-            (r'\d{1,2}/\d{1,2}/\d{4}', 'slash_date'),
-            (r'\d{1,2}-\d{1,2}-\d{4}', 'dash_date'),
-        ]
-        
-        time_pattern = r'\d{1,2}:\d{2}\s*(AM|PM|am|pm|a\.m\.|p\.m\.)'
-        
-        committee_patterns = [
-            r'(board\s+of\s+\w+)',
-            r'(city\s+council)',
-            r'(planning\s+commission)',
-            r'(committee\s+on\s+\w+)',
-            r'(metro\s+board)',
-        ]
-        
         location_keywords = ['location:', 'address:', 'zoom:', 'meeting location', 'board room', 'city hall', 'chambers']
         
         for line in lines[:300]:
@@ -575,38 +931,40 @@ class RecursiveAgendaDiscovery:
             
             line_lower = line_stripped.lower()
             
-            for pattern, _ in date_patterns:
-                match = re.search(pattern, line_stripped, re.IGNORECASE)
-                if match and facts['meeting_date'] == 'NOT FOUND':
+            if facts['meeting_date'] == 'NOT FOUND':
+                match = _DATE_RE.search(line_stripped)
+                if match:
                     facts['meeting_date'] = match.group(0)
-                    break
             
-            time_match = re.search(time_pattern, line_stripped, re.IGNORECASE)
-            if time_match and facts['meeting_time'] == 'NOT FOUND':
-                facts['meeting_time'] = time_match.group(0)
+            if facts['meeting_time'] == 'NOT FOUND':
+                match = _TIME_RE.search(line_stripped)
+                if match:
+                    facts['meeting_time'] = match.group(0)
             
-            for pattern in committee_patterns:
-                match = re.search(pattern, line_stripped, re.IGNORECASE)
-                if match and facts['committee'] == 'NOT FOUND':
+            if facts['committee'] == 'NOT FOUND':
+                match = _COMMITTEE_RE.search(line_stripped)
+                if match:
                     facts['committee'] = match.group(0).title()
-                    break
             
-            for keyword in location_keywords:
-                if keyword in line_lower and facts['location'] == 'NOT FOUND':
-                    if ':' in line_stripped:
-                        parts = line_stripped.split(':', 1)
-                        if len(parts) > 1 and len(parts[1].strip()) > 5:
-                            facts['location'] = parts[1].strip()[:120]
-                        else:
-                            facts['location'] = line_stripped[:120]
+            if facts['location'] == 'NOT FOUND' and any(keyword in line_lower for keyword in location_keywords):
+                if ':' in line_stripped:
+                    parts = line_stripped.split(':', 1)
+                    if len(parts) > 1 and len(parts[1].strip()) > 5:
+                        facts['location'] = parts[1].strip()[:120]
                     else:
                         facts['location'] = line_stripped[:120]
-                    break
+                else:
+                    facts['location'] = line_stripped[:120]
             
-            if re.match(r'^\d+[\.\)]\s+', line_stripped) or re.match(r'^[•\-\*]\s+', line_stripped):
+            if _ITEM_START_RE.match(line_stripped):
                 if len(line_stripped) > 20 and len(facts['agenda_items']) < 10:
-                    item = re.sub(r'^[\d•\-\*\.\)]+\s*', '', line_stripped)
+                    item = _ITEM_PREFIX_RE.sub('', line_stripped)
                     if len(item) > 15:
                         facts['agenda_items'].append(item[:150])
+            
+            # Stop once every fact is filled in
+            if len(facts['agenda_items']) >= 10 and 'NOT FOUND' not in (
+                    facts['meeting_date'], facts['meeting_time'], facts['committee'], facts['location']):
+                break
         
         return facts
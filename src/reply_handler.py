@@ -4,22 +4,28 @@ Reply Handler - Checks for and processes email replies
 Runs at 9am, 12pm, 3pm daily via cron
 """
 
+import functools
 import json
 import logging
 import os
+import re
 import sys
 import urllib.request
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from env_file import load_env
+except ImportError:  # Imported as src.<module>
+    from src.env_file import load_env
+
 # Load .env file
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -43,16 +49,72 @@ logger = logging.getLogger(__name__)
 
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Reply intent, matched on whole words ("stopwatch" is not a STOP)
+_UNSUBSCRIBE_RE = re.compile(r'\b(?:stop|unsubscribe|remove|opt[\s-]*out)\b', re.IGNORECASE)
+_INTEREST_RE = re.compile(r'\b(?:interested|yes|sign[\s-]*up|subscribe|tell\s+me\s+more)\b', re.IGNORECASE)
+
+
+def _json_loads(data):
+    """Parse JSON from str/bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_line(entry) -> bytes:
+    """Serialize one entry as a JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(entry) + b"\n"
+    return json.dumps(entry).encode() + b"\n"
+
+
+def _write_json(path, data):
+    """Write an indented JSON document."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
 
 class ReplyHandler:
     """Handles incoming email replies."""
     
     def __init__(self):
-        self.replies_log_path = STATE_DIR / "email_replies.json"
-        self.replies = []
+        # Append-only JSON Lines log; older installs kept one JSON array
+        self.replies_log_path = STATE_DIR / "email_replies.jsonl"
+        self.legacy_replies_path = STATE_DIR / "email_replies.json"
+        self._unsaved_replies = []
+    
+    @functools.cached_property
+    def replies(self):
+        """All logged replies, read on first access (checks only append)."""
+        return list(self.iter_replies())
+    
+    def iter_replies(self):
+        """Yield logged replies one at a time, oldest first."""
         if self.replies_log_path.exists():
-            with open(self.replies_log_path) as f:
-                self.replies = json.load(f)
+            with open(self.replies_log_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        yield _json_loads(line)
+        elif self.legacy_replies_path.exists():
+            with open(self.legacy_replies_path, 'rb') as f:
+                yield from _json_loads(f.read())
+        yield from self._unsaved_replies
+    
+    def _save_replies(self):
+        """Append replies logged this run; the first write carries over a legacy log."""
+        if not self._unsaved_replies:
+            return
+        entries = self._unsaved_replies
+        if not self.replies_log_path.exists() and self.legacy_replies_path.exists():
+            with open(self.legacy_replies_path, 'rb') as f:
+                entries = _json_loads(f.read()) + entries
+        with open(self.replies_log_path, 'ab') as f:
+            f.writelines(_json_line(entry) for entry in entries)
+        self._unsaved_replies = []
     
     def check_replies(self):
         """Check for new email replies."""
@@ -73,8 +135,7 @@ class ReplyHandler:
             logger.info("No new replies found")
         
         # Save state
-        with open(self.replies_log_path, 'w') as f:
-            json.dump(self.replies, f, indent=2)
+        self._save_replies()
     
     def _fetch_replies_from_api(self):
         """Fetch replies from Agent Mail API."""
@@ -101,12 +162,12 @@ class ReplyHandler:
         logger.info(f"Processing reply from {from_email}: {subject}")
         
         # Check for STOP/unsubscribe
-        if any(word in body.lower() for word in ["stop", "unsubscribe", "remove", "opt out"]):
+        if _UNSUBSCRIBE_RE.search(body):
             self._handle_unsubscribe(from_email)
             return
         
         # Check for interest/positive response
-        if any(word in body.lower() for word in ["interested", "yes", "sign up", "subscribe", "tell me more"]):
+        if _INTEREST_RE.search(body):
             self._handle_interest(from_email, reply)
             return
         
@@ -121,16 +182,15 @@ class ReplyHandler:
         unsub_path = STATE_DIR / "unsubscribed.json"
         unsubscribed = []
         if unsub_path.exists():
-            with open(unsub_path) as f:
-                unsubscribed = json.load(f)
+            with open(unsub_path, 'rb') as f:
+                unsubscribed = _json_loads(f.read())
         
         unsubscribed.append({
             "email": email,
             "unsubscribed_at": datetime.now().isoformat()
         })
         
-        with open(unsub_path, 'w') as f:
-            json.dump(unsubscribed, f, indent=2)
+        _write_json(unsub_path, unsubscribed)
         
         self._log_reply(email, "Unsubscribe Request", "User requested removal", "unsubscribed")
     
@@ -157,13 +217,16 @@ Max
     
     def _log_reply(self, email, subject, body, status):
         """Log the reply for dashboard."""
-        self.replies.append({
+        entry = {
             "timestamp": datetime.now().isoformat(),
             "from": email,
             "subject": subject,
             "preview": body[:200] + "..." if len(body) > 200 else body,
             "status": status
-        })
+        }
+        self._unsaved_replies.append(entry)
+        if 'replies' in self.__dict__:
+            self.replies.append(entry)
         
         logger.info(f"Reply logged: {email} - {status}")
 
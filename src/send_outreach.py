@@ -6,13 +6,51 @@ Usage: python3 src/send_outreach.py --dry-run (preview)
 """
 
 import argparse
+import asyncio
+import concurrent.futures
+import functools
 import json
 import logging
 import os
+import pickle
 import sys
+import time
 import urllib.request
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import Optional
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 -- enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    from v2.http_client import get_async_client, aclose_async_client
+except ImportError:  # Run as a script from src/
+    get_async_client = None
 
 # Configuration
 OUTREACH_DIR = Path(__file__).parent.parent / "outreach"
@@ -20,23 +58,236 @@ LOGS_DIR = Path(__file__).parent.parent / "logs"
 
 AGENT_MAIL_API_KEY = os.environ.get("AGENT_MAIL_API_KEY")
 OPERATOR_EMAIL = os.environ.get("OPERATOR_EMAIL", "mnguyen9@usc.edu")
+AGENT_MAIL_SEND_URL = "https://api.agentmail.ai/v1/send"
+AGENT_MAIL_BATCH_URL = "https://api.agentmail.ai/v1/send/batch"
+
+# Send every pending lead in one batch request instead of one request each
+USE_BATCH_API = os.environ.get("USE_BATCH_API") == "1"
 
-# Setup logging
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
+# Keep-alive connections to the mail API, shared by all sends. A send is not
+# idempotent, so only retry when the request was rejected before processing
+# (connect errors, 429, 503) -- never after a read error.
+_HTTP = urllib3.PoolManager(
+    maxsize=20,
+    retries=urllib3.Retry(total=3, read=0, backoff_factor=0.5,
+                          status_forcelist=(429, 503), allowed_methods=frozenset({"POST"}))
+) if urllib3 is not None else None
+
+class _LazyFileHandler(logging.FileHandler):
+    """Creates the log directory and opens the file on the first record only."""
+    
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+# Setup logging (no file I/O until something is logged)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(LOGS_DIR / "outreach.log"),
+        _LazyFileHandler(LOGS_DIR / "outreach.log"),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
 
+_EMAIL_SUBJECT = "Quick question about LA government meetings"
+
+_EMAIL_BODY = """Hi {name},
+
+I came across your work with {reason}. I built a simple tool that monitors LA City Council, PLUM Committee, and County Board agendas - sending email alerts when new items are posted.
+
+It's free during beta. Thought it might save you time tracking relevant meetings.
+
+Interested? https://maxnguyen.github.io/la-agenda-alerts/
+
+If not, just reply STOP and I won't email again.
+
+Best,
+Max
+--
+LA Agenda Alerts
+mnguyen9@usc.edu
+""".format
+
+
+@functools.lru_cache(maxsize=4096)
+def _craft_email_cached(name: str, reason: str) -> tuple:
+    """(subject, body) for a lead; memoized so preview and send don't re-format."""
+    return _EMAIL_SUBJECT, _EMAIL_BODY(name=name, reason=reason)
+
+
+# Send payloads only differ in to/subject/body; the rest is encoded once
+_PAYLOAD_PREFIX = b'{"from":"mnguyen9@usc.edu","reply_to":"mnguyen9@usc.edu","to":'
+
+_SEND_HEADERS = {
+    "Content-Type": "application/json",
+    "Authorization": f"Bearer {AGENT_MAIL_API_KEY}"
+}
+
+
+def _json_str(value: str) -> bytes:
+    """A string as a JSON literal (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+
+def _load_json(path: Path):
+    """Read a JSON file (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
+
+def _leads_cache_key(path: Path) -> tuple:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_leads_cache(path: Path) -> Optional[list]:
+    """Leads pickled by an earlier run, or None if leads.json changed since."""
+    cache_file = path.with_name(".leads.cache.pkl")
+    try:
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached["key"] == _leads_cache_key(path):
+            return cached["leads"]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Leads cache read error: {e}")
+    return None
+
+
+def _load_leads(path: Path) -> list:
+    """All leads, from the pickle cache when leads.json is unchanged."""
+    leads = _read_leads_cache(path)
+    if leads is not None:
+        return leads
+    
+    key = _leads_cache_key(path)
+    leads = _load_json(path).get("leads", [])
+    try:
+        tmp = path.with_name(".leads.cache.pkl.tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump({"key": key, "leads": leads}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path.with_name(".leads.cache.pkl"))
+    except OSError as e:
+        logger.warning(f"Leads cache write error: {e}")
+    return leads
+
+
+def _iter_leads(path: Path):
+    """Yield leads one at a time (streamed with ijson when available)."""
+    if ijson is None:
+        yield from _load_json(path).get("leads", [])
+        return
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'leads.item', use_float=True)
+
+
+def _write_json_atomic(path: Path, data):
+    """Write indented JSON to a temp file and rename it over path, so an
+    interrupted run never leaves a truncated file behind."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds to wait after a 429, from Retry-After or X-RateLimit-Reset (None if absent)."""
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    
+    reset = headers.get("X-RateLimit-Reset")
+    if reset:
+        try:
+            reset = float(reset)
+        except ValueError:
+            return None
+        # Either an epoch timestamp or seconds from now
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+    return None
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket for async sends: up to `burst` at once, refilled at `rps`.
+    
+    After a 429, throttle() pauses all sends for the server's delay and
+    halves the rate (again on repeats) for `cooldown` seconds.
+    """
+    
+    def __init__(self, rps: float = 2.0, burst: int = 5, cooldown: float = 60.0):
+        self.rps = rps
+        self.burst = burst
+        self.cooldown = cooldown
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._slow_rps = rps
+        self._slow_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _rate(self, now: float) -> float:
+        return self._slow_rps if now < self._slow_until else self.rps
+    
+    async def acquire(self):
+        """Wait for a token (waiters are served one at a time)."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                
+                rate = self._rate(now)
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / rate)
+    
+    def throttle(self, delay: float):
+        """Back off after the provider rate-limited us."""
+        now = time.monotonic()
+        self._slow_rps = self._rate(now) / 2
+        self._slow_until = now + delay + self.cooldown
+        self._resume_at = max(self._resume_at, now + delay)
+        self._tokens = 0.0
+        self._updated = self._resume_at
+
+
 class OutreachSender:
     """Manages personalized outreach emails."""
     
+    # Sends are network-bound; run this many API calls at once
+    MAX_CONCURRENT_SENDS = 16
+    
+    # Async sends are paced by a token bucket to stay under provider quotas
+    SEND_RPS = 2.0
+    SEND_BURST = 5
+    MAX_RATE_LIMIT_RETRIES = 3
+    
     def __init__(self):
         self.leads_path = OUTREACH_DIR / "leads.json"
         self.sent_path = OUTREACH_DIR / "sent.json"
@@ -46,19 +297,38 @@ class OutreachSender:
             logger.error("No leads.json found. Create it from leads_template.json")
             sys.exit(1)
         
-        with open(self.leads_path) as f:
-            data = json.load(f)
-            self.leads = data.get("leads", [])
-        
         # Load sent tracking
         self.sent = []
         if self.sent_path.exists():
-            with open(self.sent_path) as f:
-                self.sent = json.load(f)
+            self.sent = _load_json(self.sent_path)
+        self._sent_emails = {entry["email"] for entry in self.sent}
+    
+    @functools.cached_property
+    def leads(self) -> list:
+        """Every lead, loaded on first use (sends rewrite the whole file)."""
+        return _load_leads(self.leads_path)
+    
+    def _pending_leads(self, leads=None) -> list:
+        """
+        Pending leads not already in the sent log (first entry wins for a
+        repeated address); streamed from disk if the full list isn't loaded.
+        """
+        if leads is None:
+            leads = (self.__dict__.get("leads")
+                     or _read_leads_cache(self.leads_path)
+                     or _iter_leads(self.leads_path))
+        
+        seen = set(self._sent_emails)
+        pending = []
+        for lead in leads:
+            if lead.get("status") == "pending" and lead["email"] not in seen:
+                seen.add(lead["email"])
+                pending.append(lead)
+        return pending
     
     def preview_emails(self):
         """Show all pending emails without sending."""
-        pending = [l for l in self.leads if l.get("status") == "pending"]
+        pending = self._pending_leads()
         
         if not pending:
             print("No pending leads to contact.")
@@ -81,7 +351,8 @@ class OutreachSender:
             logger.error("AGENT_MAIL_API_KEY not set")
             return
         
-        pending = [l for l in self.leads if l.get("status") == "pending"][:limit]
+        # Work on the full list; the whole file is rewritten below
+        pending = self._pending_leads(self.leads)[:limit]
         
         if not pending:
             print("No pending leads to contact.")
@@ -89,99 +360,153 @@ class OutreachSender:
         
         print(f"\nSending {len(pending)} emails...")
         print("Press Ctrl+C within 3 seconds to cancel...")
-        import time
         time.sleep(3)
         
+        if USE_BATCH_API:
+            results = self._send_batch(pending)
+        elif httpx is not None:
+            results = asyncio.run(self._send_emails_async(pending))
+        else:
+            workers = min(self.MAX_CONCURRENT_SENDS, len(pending))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._send_single, pending))
+        
         sent_count = 0
-        for lead in pending:
-            if self._send_single(lead):
+        for lead, (sent, message_id) in zip(pending, results):
+            if sent:
                 lead["status"] = "sent"
                 lead["sent_at"] = datetime.now().isoformat()
                 sent_count += 1
                 
                 # Track in sent log
+                self._sent_emails.add(lead["email"])
                 self.sent.append({
                     "email": lead["email"],
                     "sent_at": lead["sent_at"],
-                    "status": "sent"
+                    "status": "sent",
+                    "message_id": message_id
                 })
         
-        # Save updated leads
-        with open(self.leads_path, 'w') as f:
-            json.dump({"leads": self.leads}, f, indent=2)
-        
-        # Save sent log
-        with open(self.sent_path, 'w') as f:
-            json.dump(self.sent, f, indent=2)
+        # Save updated leads and sent log
+        _write_json_atomic(self.leads_path, {"leads": self.leads})
+        _write_json_atomic(self.sent_path, self.sent)
         
         print(f"\n✅ Sent {sent_count} emails")
         print(f"📊 Total sent: {len(self.sent)}")
     
     def _craft_email(self, lead: dict) -> dict:
         """Create personalized email for a lead."""
-        name = lead.get("name", "there")
-        reason = lead.get("reason", "")
-        
-        # Extract domain for personalization
-        domain = lead["email"].split("@")[-1]
-        org = domain.split(".")[0].title() if domain else "your organization"
+        subject, body = _craft_email_cached(lead.get("name", "there"), lead.get("reason", ""))
+        return {"subject": subject, "body": body}
+    
+    def _build_request(self, lead: dict) -> tuple:
+        """JSON body and headers for one send."""
+        email = self._craft_email(lead)
+        body = b"".join((_PAYLOAD_PREFIX, _json_str(lead["email"]),
+                         b',"subject":', _json_str(email["subject"]),
+                         b',"body":', _json_str(email["body"]), b"}"))
+        return body, dict(_SEND_HEADERS)
+    
+    def _send_single(self, lead: dict) -> tuple:
+        """Send a single email; returns (ok, message_id)."""
+        body, headers = self._build_request(lead)
+        headers["Connection"] = "keep-alive"  # HTTP/1.1 only; HTTP/2 forbids it
         
-        subject = "Quick question about LA government meetings"
+        try:
+            result = json.loads(self._post(body, headers).decode())
+            logger.info(f"Sent to {lead['email']}: {result.get('message_id')}")
+            return True, result.get("message_id")
+            
+        except Exception as e:
+            logger.error(f"Failed to send to {lead['email']}: {e}")
+            lead["status"] = "failed"
+            lead["error"] = str(e)
+            return False, None
+    
+    def _send_batch(self, pending: list) -> list:
+        """
+        Send all pending emails in one batch request; returns (ok, message_id)
+        per lead, in order. The batch is not retried lead by lead, since part
+        of it may already have been delivered.
+        """
+        messages = [self._build_request(lead)[0] for lead in pending]
+        body = b"".join((b'{"messages":[', b",".join(messages), b"]}"))
+        headers = dict(_SEND_HEADERS, Connection="keep-alive")
         
-        body = f"""Hi {name},
-
-I came across your work with {reason}. I built a simple tool that monitors LA City Council, PLUM Committee, and County Board agendas - sending email alerts when new items are posted.
-
-It's free during beta. Thought it might save you time tracking relevant meetings.
-
-Interested? https://maxnguyen.github.io/la-agenda-alerts/
-
-If not, just reply STOP and I won't email again.
-
-Best,
-Max
---
-LA Agenda Alerts
-mnguyen9@usc.edu
-"""
+        try:
+            results = json.loads(self._post(body, headers, AGENT_MAIL_BATCH_URL).decode()).get("results", [])
+        except Exception as e:
+            logger.error(f"Batch send of {len(pending)} emails failed: {e}")
+            results = [{"status": "failed", "error": str(e)}] * len(pending)
         
-        return {"subject": subject, "body": body}
+        outcomes = []
+        for i, lead in enumerate(pending):
+            result = results[i] if i < len(results) else {"status": "failed", "error": "missing from batch response"}
+            if result.get("status") in ("sent", "queued", "ok"):
+                logger.info(f"Sent to {lead['email']}: {result.get('message_id')}")
+                outcomes.append((True, result.get("message_id")))
+            else:
+                logger.error(f"Failed to send to {lead['email']}: {result.get('error')}")
+                lead["status"] = "failed"
+                lead["error"] = str(result.get("error"))
+                outcomes.append((False, None))
+        return outcomes
     
-    def _send_single(self, lead: dict) -> bool:
-        """Send a single email."""
-        email = self._craft_email(lead)
+    async def _send_emails_async(self, pending: list) -> list:
+        """Send all pending emails on one shared httpx client (HTTP/2 when h2 is installed)."""
+        limiter = AsyncRateLimiter(self.SEND_RPS, self.SEND_BURST)
         
-        payload = {
-            "to": lead["email"],
-            "subject": email["subject"],
-            "body": email["body"],
-            "from": "mnguyen9@usc.edu",
-            "reply_to": "mnguyen9@usc.edu"
-        }
+        def sends(client):
+            return asyncio.gather(*(self._asend_single(client, limiter, lead) for lead in pending))
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {AGENT_MAIL_API_KEY}"
-        }
+        if get_async_client is not None:
+            try:
+                return await sends(get_async_client())
+            finally:
+                await aclose_async_client()
+        
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        timeout = httpx.Timeout(30.0, connect=5.0)
+        async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, limits=limits, timeout=timeout) as client:
+            return await sends(client)
+    
+    async def _asend_single(self, client, limiter: AsyncRateLimiter, lead: dict) -> tuple:
+        """Async counterpart of _send_single; returns (ok, message_id)."""
+        body, headers = self._build_request(lead)
         
         try:
-            req = urllib.request.Request(
-                "https://api.agentmail.ai/v1/send",
-                data=json.dumps(payload).encode(),
-                headers=headers,
-                method="POST"
-            )
+            # A 429 means the send was refused, so it is safe to try again
+            for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+                await limiter.acquire()
+                response = await client.post(AGENT_MAIL_SEND_URL, content=body, headers=headers)
+                if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    break
+                delay = _retry_after(response.headers)
+                limiter.throttle(delay if delay is not None else 2.0 ** attempt)
+                logger.warning(f"Rate limited sending to {lead['email']}, backing off")
+            response.raise_for_status()
+            result = response.json()
+            logger.info(f"Sent to {lead['email']}: {result.get('message_id')}")
+            return True, result.get("message_id")
             
-            with urllib.request.urlopen(req, timeout=30) as response:
-                result = json.loads(response.read().decode())
-                logger.info(f"Sent to {lead['email']}: {result.get('message_id')}")
-                return True
-                
         except Exception as e:
             logger.error(f"Failed to send to {lead['email']}: {e}")
             lead["status"] = "failed"
             lead["error"] = str(e)
-            return False
+            return False, None
+    
+    def _post(self, body: bytes, headers: dict, url: str = AGENT_MAIL_SEND_URL) -> bytes:
+        """POST to a send endpoint over the shared pool (urllib fallback)."""
+        if _HTTP is not None:
+            response = _HTTP.request("POST", url, body=body, headers=headers,
+                                     timeout=urllib3.Timeout(connect=5, read=30))
+            if response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status}")
+            return response.data
+        
+        req = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.read()
 
 
 def main():
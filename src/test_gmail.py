@@ -4,24 +4,30 @@ Gmail SMTP backup for email notifications
 Usage: Set GMAIL_USER and GMAIL_APP_PASSWORD in .env
 """
 
+import asyncio
 import json
 import logging
 import os
 import smtplib
 import sys
+import time
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
 
+try:
+    import aiosmtplib
+except ImportError:
+    aiosmtplib = None
+
+try:
+    from env_file import load_env
+except ImportError:  # Imported as src.<module>
+    from src.env_file import load_env
+
 # Load .env
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -30,41 +36,132 @@ LOGS_DIR = Path(__file__).parent.parent / "logs"
 
 GMAIL_USER = os.environ.get("GMAIL_USER")
 GMAIL_APP_PASSWORD = os.environ.get("GMAIL_APP_PASSWORD")
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+SEND_INTERVAL = 1.0  # seconds between messages in a batch (Gmail throttles bursts)
 
-# Setup logging
-LOGS_DIR.mkdir(parents=True, exist_ok=True)
+class _LazyFileHandler(logging.FileHandler):
+    """Creates the log directory and opens the file on the first record only."""
+    
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+    
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+# Setup logging (no file I/O until something is logged)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(LOGS_DIR / "gmail.log"),
+        _LazyFileHandler(LOGS_DIR / "gmail.log"),
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
 
-def send_test_email(to_email=None):
-    """Send a test email via Gmail SMTP."""
-    
-    if not GMAIL_USER or not GMAIL_APP_PASSWORD:
-        logger.error("GMAIL_USER or GMAIL_APP_PASSWORD not set in .env")
-        logger.info("To use Gmail:")
-        logger.info("1. Enable 2FA on Google account")
-        logger.info("2. Generate App Password at myaccount.google.com/apppasswords")
-        logger.info("3. Add to .env: GMAIL_USER=your.email@gmail.com")
-        logger.info("4. Add to .env: GMAIL_APP_PASSWORD=xxxx xxxx xxxx xxxx")
+class GmailMailer:
+    """One authenticated SMTP session reused for a batch of messages.
+
+    STARTTLS and AUTH happen once on enter instead of once per message;
+    a dropped session is re-opened and the message retried once.
+    """
+
+    def __init__(self, interval=SEND_INTERVAL):
+        self.interval = interval
+        self.server = None
+        self._last_send = 0.0
+
+    def __enter__(self):
+        self._connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except smtplib.SMTPException:
+                self.server.close()
+            self.server = None
         return False
+
+    def _connect(self):
+        self.server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+        self.server.starttls()
+        self.server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+
+    def send(self, msg):
+        wait = self._last_send + self.interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            self.server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            logger.warning("SMTP session dropped, reconnecting")
+            self._connect()
+            self.server.send_message(msg)
+        self._last_send = time.monotonic()
+
+
+async def asend_messages(messages, interval=SEND_INTERVAL):
+    """
+    Send messages over one SMTP session without blocking the event loop.
     
-    to = to_email or GMAIL_USER
+    SMTP is stateful, so messages go out one after another on the shared
+    session rather than being gathered. Without aiosmtplib the blocking
+    GmailMailer runs in a worker thread instead.
+    """
+    if aiosmtplib is None:
+        await asyncio.to_thread(_send_messages, messages, interval)
+        return
     
+    smtp = aiosmtplib.SMTP(hostname=SMTP_HOST, port=SMTP_PORT, start_tls=False)
+    await smtp.connect()
     try:
-        msg = MIMEMultipart()
-        msg['From'] = GMAIL_USER
-        msg['To'] = to
-        msg['Subject'] = "[LA Agenda Alerts] Test Email via Gmail SMTP"
-        
-        body = f"""This is a test email from LA Agenda Alerts using Gmail SMTP.
+        await smtp.starttls()
+        await smtp.login(GMAIL_USER, GMAIL_APP_PASSWORD)
+        for index, msg in enumerate(messages):
+            if index:
+                await asyncio.sleep(interval)
+            await smtp.send_message(msg)
+    finally:
+        try:
+            await smtp.quit()
+        except aiosmtplib.SMTPException:
+            smtp.close()
+
+
+def _send_messages(messages, interval=SEND_INTERVAL):
+    """Blocking counterpart of asend_messages."""
+    with GmailMailer(interval) as mailer:
+        for msg in messages:
+            mailer.send(msg)
+
+
+def _gmail_configured():
+    """Check credentials, explaining how to set them up if missing."""
+    if GMAIL_USER and GMAIL_APP_PASSWORD:
+        return True
+    logger.error("GMAIL_USER or GMAIL_APP_PASSWORD not set in .env")
+    logger.info("To use Gmail:")
+    logger.info("1. Enable 2FA on Google account")
+    logger.info("2. Generate App Password at myaccount.google.com/apppasswords")
+    logger.info("3. Add to .env: GMAIL_USER=your.email@gmail.com")
+    logger.info("4. Add to .env: GMAIL_APP_PASSWORD=xxxx xxxx xxxx xxxx")
+    return False
+
+
+def _build_test_message(to):
+    """Build the test email."""
+    msg = MIMEMultipart()
+    msg['From'] = GMAIL_USER
+    msg['To'] = to
+    msg['Subject'] = "[LA Agenda Alerts] Test Email via Gmail SMTP"
+    
+    body = f"""This is a test email from LA Agenda Alerts using Gmail SMTP.
 
 Time: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
@@ -79,15 +176,37 @@ Gmail is more reliable than Agent Mail on restricted networks.
 Best,
 LA Agenda Alerts
 """
+    
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def send_test_email(to_email=None):
+    """Send a test email via Gmail SMTP."""
+    if not _gmail_configured():
+        return False
+    
+    to = to_email or GMAIL_USER
+    
+    try:
+        _send_messages([_build_test_message(to)])
+        logger.info(f"✅ Test email sent successfully to {to}")
+        return True
         
-        msg.attach(MIMEText(body, 'plain'))
-        
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        
+    except Exception as e:
+        logger.error(f"❌ Failed to send email: {e}")
+        return False
+
+
+async def asend_test_email(to_email=None):
+    """Send a test email via Gmail SMTP from async code."""
+    if not _gmail_configured():
+        return False
+    
+    to = to_email or GMAIL_USER
+    
+    try:
+        await asend_messages([_build_test_message(to)])
         logger.info(f"✅ Test email sent successfully to {to}")
         return True
         
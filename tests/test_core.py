@@ -6,79 +6,68 @@ Run with: python3 -m pytest tests/ or ./scripts/run_tests.sh
 
 import hashlib
 import json
+import sqlite3
 import sys
-import tempfile
 from pathlib import Path
 
-# Add src to path
+import pytest
+
+# Add src (and the project root, for src.* imports) to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import diff
 
 
-def test_event_id_generation():
+# Event fields for the event ID tests; every case describes a different item
+EVENT_CASES = [
+    {"change_type": "new_item", "item_id": "test123", "source": "county_bos", "title": "Test Item"},
+    {"change_type": "new_item", "item_id": "item1", "source": "county_bos", "title": "Item One"},
+    {"change_type": "new_item", "item_id": "item2", "source": "county_bos", "title": "Item Two"},
+]
+
+
+@pytest.fixture(scope="module")
+def state_dir(tmp_path_factory):
+    """One temporary directory shared by this module's file-backed tests."""
+    return tmp_path_factory.mktemp("state")
+
+
+@pytest.mark.parametrize("fields", EVENT_CASES, ids=lambda c: c["item_id"])
+def test_event_id_generation(fields):
     """Test that event IDs are stable and deterministic."""
-    event1 = diff.ChangeEvent(
-        change_type="new_item",
-        item_id="test123",
-        source="county_bos",
-        title="Test Item"
-    )
-    
-    event2 = diff.ChangeEvent(
-        change_type="new_item",
-        item_id="test123",
-        source="county_bos",
-        title="Test Item"
-    )
-    
     # Same inputs should produce same event_id
-    assert event1.event_id == event2.event_id
+    assert diff.ChangeEvent(**fields).event_id == diff.ChangeEvent(**fields).event_id
     print("✅ Event ID generation is deterministic")
 
 
 def test_event_id_uniqueness():
     """Test that different events have different IDs."""
-    event1 = diff.ChangeEvent(
+    events = [diff.ChangeEvent(**fields) for fields in EVENT_CASES]
+    assert len({event.event_id for event in events}) == len(events)
+    print("✅ Different events have unique IDs")
+
+
+def test_dedupe(state_dir):
+    """Test that duplicate events are filtered."""
+    worker = diff.DiffWorker()
+    worker.sent_events_path = state_dir / "sent_events.json"
+    
+    # Create initial event
+    event = diff.ChangeEvent(
         change_type="new_item",
         item_id="item1",
         source="county_bos",
-        title="Item One"
+        title="Test"
     )
     
-    event2 = diff.ChangeEvent(
-        change_type="new_item",
-        item_id="item2",
-        source="county_bos",
-        title="Item Two"
-    )
+    # Save as sent
+    worker._save_sent_events({event.event_id})
     
-    assert event1.event_id != event2.event_id
-    print("✅ Different events have unique IDs")
-
-
-def test_dedupe():
-    """Test that duplicate events are filtered."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        state_dir = Path(tmpdir)
-        worker = diff.DiffWorker()
-        worker.sent_events_path = state_dir / "sent_events.json"
-        
-        # Create initial event
-        event = diff.ChangeEvent(
-            change_type="new_item",
-            item_id="item1",
-            source="county_bos",
-            title="Test"
-        )
-        
-        # Save as sent
-        worker._save_sent_events({event.event_id})
-        
-        # Load and check
-        sent = worker._load_sent_events()
-        assert event.event_id in sent
-        print("✅ Deduplication works correctly")
+    # Load and check
+    sent = worker._load_sent_events()
+    assert event.event_id in sent
+    print("✅ Deduplication works correctly")
 
 
 def test_keyword_matching():
@@ -126,28 +115,123 @@ def test_keyword_matching():
     print("✅ Keyword matching works correctly")
 
 
-def run_all_tests():
-    """Run all tests."""
-    print("Running LA Agenda Alerts Tests...")
-    print("=" * 40)
+def test_strip_html():
+    """Test that the HTML scanner removes scripts, styles and comments only."""
+    from src.parser import _strip_html
     
-    try:
-        test_event_id_generation()
-        test_event_id_uniqueness()
-        test_dedupe()
-        test_keyword_matching()
-        
-        print("=" * 40)
-        print("✅ All tests passed!")
-        return 0
-        
-    except AssertionError as e:
-        print(f"❌ Test failed: {e}")
-        return 1
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return 1
+    text = _strip_html("a <script>var x = '<b>';</script> b <style>p {}</style> c <!-- note --> d")
+    assert text.split() == ["a", "b", "c", "d"]
+    
+    # Tags that merely start with "script"/"style" are ordinary tags
+    assert _strip_html("a <scriptfoo> b").split() == ["a", "b"]
+    assert _strip_html("a <style-guide> b </style-guide> c").split() == ["a", "b", "c"]
+    
+    # Markup is kept when only scripts/styles are stripped
+    assert _strip_html("<p>a</p><script>x</script>", strip_tags=False) == "<p>a</p> "
+    
+    # Unterminated script runs to the end of the document
+    assert _strip_html("a <script>never closed").split() == ["a"]
+    print("✅ HTML stripping works correctly")
+
+
+def test_main_content_finder():
+    """Test that the largest substantial container of the first kind wins."""
+    from src.parser import _MainContentFinder
+    
+    filler = " ".join(f"word{i}" for i in range(120))
+    html = (
+        f'<nav>Home</nav>'
+        f'<div class="Page-Content"><p>{filler}</p><p>Item 1</p></div>'
+        f'<div class="content"><p>{filler[:600]}</p></div>'
+        f'<div class="main">{filler} {filler}</div>'
+    )
+    finder = _MainContentFinder()
+    finder.feed(html)
+    text = finder.container_text()
+    assert text is not None and "Item 1" in text and "Home" not in text
+    
+    # Containers under 500 chars don't count
+    finder = _MainContentFinder()
+    finder.feed("<main>too short</main>")
+    assert finder.container_text() is None
+    print("✅ Main content detection works correctly")
+
+
+def test_parse_cache(state_dir):
+    """Test that parse results are reused from memory and from disk."""
+    from src.parser import ProductionParser
+    
+    content = ("<html><body><main>" + "<p>Regular meeting agenda item</p>" * 40 + "</main></body></html>").encode()
+    cache_dir = state_dir / "parse_cache"
+    parser = ProductionParser(cache_dir)
+    first = parser.parse(content, "text/html", "https://example.com/agenda", "test")
+    assert parser.parse(content, "text/html", "https://example.com/agenda", "test") is first
+    assert len(list((cache_dir / "parsed").glob("*.pkl"))) == 1
+    
+    # A fresh parser finds the result on disk
+    cached = ProductionParser(cache_dir).parse(content, "text/html", "https://example.com/agenda", "test")
+    assert cached.text == first.text
+    assert cached.fingerprint == first.fingerprint
+    print("✅ Parse cache works correctly")
+
+
+def test_reply_log_migration(state_dir, monkeypatch):
+    """Test that a legacy JSON reply log is carried over to JSON Lines."""
+    from src import reply_handler
+    
+    replies_dir = state_dir / "replies"
+    replies_dir.mkdir()
+    legacy = [{"from": "old@example.com", "status": "needs_review"}]
+    (replies_dir / "email_replies.json").write_text(json.dumps(legacy))
+    monkeypatch.setattr(reply_handler, "STATE_DIR", replies_dir)
+    
+    handler = reply_handler.ReplyHandler()
+    assert handler.replies == legacy
+    
+    handler._log_reply("new@example.com", "Re: alerts", "yes please", "interested_followup_sent")
+    handler._save_replies()
+    
+    lines = (replies_dir / "email_replies.jsonl").read_text().splitlines()
+    assert [json.loads(line)["from"] for line in lines] == ["old@example.com", "new@example.com"]
+    
+    # Later writes only append
+    handler._log_reply("third@example.com", "Re: alerts", "STOP", "unsubscribed")
+    handler._save_replies()
+    replies = list(reply_handler.ReplyHandler().iter_replies())
+    assert [r["from"] for r in replies] == ["old@example.com", "new@example.com", "third@example.com"]
+    print("✅ Reply log migration works correctly")
+
+
+
+def test_notifier_queue(state_dir, monkeypatch):
+    """Test that the notifier works the alert queue on the init_db schema."""
+    from v2 import init_db, notifier
+    
+    db_path = state_dir / "notifier" / "v2.db"
+    db_path.parent.mkdir()
+    monkeypatch.setattr(init_db, "DB_PATH", db_path)
+    monkeypatch.setattr(notifier, "DB_PATH", db_path)
+    monkeypatch.delenv("GMAIL_USER", raising=False)
+    init_db.init_database()
+    
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("INSERT INTO users (id, email, plan) VALUES ('u1', 'a@example.com', 'free')")
+        conn.executemany("""
+            INSERT INTO alerts_sent (id, user_id, source_id, change_type, title, status, retry_count)
+            VALUES (?, 'a@example.com', 'src', 'new_item', 'Item', 'retrying', ?)
+        """, [("fresh", 0), ("spent", 1)])
+    
+    # Without SMTP credentials the fresh alert is queued for retry; the
+    # free plan's single attempt is already used up by the other one
+    notifier.V2Notifier().send_pending_notifications()
+    rows = dict((row[0], row[1:]) for row in conn.execute(
+        "SELECT id, status, retry_count, error_message FROM alerts_sent"))
+    conn.close()
+    assert rows["fresh"] == ("retrying", 1, None)
+    assert rows["spent"] == ("failed", 1, "Max retries exceeded")
+    print("✅ Notifier queue works correctly")
 
 
 if __name__ == "__main__":
-    sys.exit(run_all_tests())
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -4,51 +4,117 @@ V2 Authentication - Magic Link System
 No passwords, secure, Pro+ only
 """
 
+import base64
 import json
+import os
 import secrets
 import sqlite3
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict
 
+try:
+    import db_pool
+except ImportError:  # Imported as v2.<module>
+    from v2 import db_pool
+
 DB_PATH = Path(__file__).parent.parent / "data" / "v2" / "la_agenda_v2.db"
 
+_schema_ready = False
+
+MAGIC_LINK_TTL_SECONDS = 3600
+
+TOKEN_BYTES = 32  # Same 256 bits as secrets.token_urlsafe(32)
+TOKEN_POOL_SIZE = 64
+
+_token_lock = threading.Lock()
+_token_pool = []
+_token_pool_pid = None
+
+def _new_token() -> str:
+    """
+    Return a URL-safe login token from the per-process pool.
+    
+    One os.urandom() call fills TOKEN_POOL_SIZE tokens, so bulk invites
+    don't pay a syscall per link. The pool is dropped after a fork so a
+    child never hands out its parent's tokens.
+    """
+    global _token_pool_pid
+    with _token_lock:
+        if _token_pool_pid != os.getpid():
+            _token_pool.clear()
+            _token_pool_pid = os.getpid()
+        if not _token_pool:
+            buf = secrets.token_bytes(TOKEN_BYTES * TOKEN_POOL_SIZE)
+            _token_pool.extend(
+                base64.urlsafe_b64encode(buf[i:i + TOKEN_BYTES]).rstrip(b"=").decode("ascii")
+                for i in range(0, len(buf), TOKEN_BYTES)
+            )
+        return _token_pool.pop()
+
+def _ensure_schema(conn: sqlite3.Connection):
+    """
+    Create the auth lookup indexes once per process.
+    
+    users.email is already indexed by its UNIQUE constraint; tokens only
+    exist while a login is pending, so their index is partial. Also converts
+    pending expiries from local ISO strings to Unix epoch seconds.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    try:
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_users_magic_token
+            ON users(magic_link_token) WHERE magic_link_token IS NOT NULL
+        """)
+        conn.execute("""
+            UPDATE users
+            SET magic_link_expires = CAST(strftime('%s', magic_link_expires, 'utc') AS INTEGER)
+            WHERE typeof(magic_link_expires) = 'text'
+        """)
+        conn.commit()
+    except sqlite3.OperationalError:
+        return  # Database not initialized yet (see init_db.py)
+    _schema_ready = True
+
 def get_db():
-    """Get database connection with row factory."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """
+    Get this thread's database connection (row factory set).
+    
+    The connection stays open for the thread's lifetime; callers must not
+    close it, and wrap writes in `with conn:` to commit them.
+    """
+    conn = db_pool.get_db(DB_PATH)
+    _ensure_schema(conn)
     return conn
 
 def generate_magic_link(email: str) -> Optional[str]:
     """Generate a magic link token for user login."""
     conn = get_db()
-    cursor = conn.cursor()
     
     # Check if user exists and requires login
-    cursor.execute("SELECT id, plan FROM users WHERE email = ? AND status = 'active'", (email,))
-    user = cursor.fetchone()
+    user = conn.execute("SELECT id, plan FROM users WHERE email = ? AND status = 'active'", (email,)).fetchone()
     
     if not user:
-        conn.close()
         return None
     
     # Free users don't need login
     if user["plan"] == "free":
-        conn.close()
         return "FREE_TIER_NO_LOGIN_REQUIRED"
     
-    # Generate secure token
-    token = secrets.token_urlsafe(32)
-    expires = datetime.now() + timedelta(hours=1)
-    
-    cursor.execute("""
-        UPDATE users 
-        SET magic_link_token = ?, magic_link_expires = ?
-        WHERE id = ?
-    """, (token, expires.isoformat(), user["id"]))
+    # Generate secure token (expiry stored as Unix epoch seconds)
+    token = _new_token()
+    expires = int(time.time()) + MAGIC_LINK_TTL_SECONDS
     
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            UPDATE users 
+            SET magic_link_token = ?, magic_link_expires = ?
+            WHERE id = ?
+        """, (token, expires, user["id"]))
     
     # Return full magic link URL
     return f"https://maxnguyen.github.io/la-agenda-alerts/login?token={token}"
@@ -56,35 +122,28 @@ def generate_magic_link(email: str) -> Optional[str]:
 def validate_token(token: str) -> Optional[Dict]:
     """Validate a magic link token."""
     conn = get_db()
-    cursor = conn.cursor()
     
-    cursor.execute("""
+    user = conn.execute("""
         SELECT id, email, plan, magic_link_expires 
         FROM users 
         WHERE magic_link_token = ? AND status = 'active'
-    """, (token,))
-    
-    user = cursor.fetchone()
+    """, (token,)).fetchone()
     
     if not user:
-        conn.close()
         return None
     
-    # Check expiration
-    expires = datetime.fromisoformat(user["magic_link_expires"])
-    if datetime.now() > expires:
-        conn.close()
+    # Check expiration (NULL if a legacy expiry couldn't be converted)
+    expires = user["magic_link_expires"]
+    if expires is None or time.time() > expires:
         return None
     
     # Update last login and clear token
-    cursor.execute("""
-        UPDATE users 
-        SET last_login = ?, magic_link_token = NULL, magic_link_expires = NULL
-        WHERE id = ?
-    """, (datetime.now().isoformat(), user["id"]))
-    
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            UPDATE users 
+            SET last_login = ?, magic_link_token = NULL, magic_link_expires = NULL
+            WHERE id = ?
+        """, (datetime.now().isoformat(), user["id"]))
     
     return {
         "id": user["id"],
@@ -92,45 +151,64 @@ def validate_token(token: str) -> Optional[Dict]:
         "plan": user["plan"]
     }
 
-def check_auth_required(email: str) -> bool:
-    """Check if user requires authentication."""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT plan FROM users WHERE email = ?", (email,))
-    user = cursor.fetchone()
-    conn.close()
-    
-    if not user:
-        return False  # New users default to free
-    
+def fetch_user_context(email: str) -> Dict:
+    """
+    Everything the plan checks need, in one query.
+    
+    Unknown users count as free. Pass the result as `user` to the checks
+    below to answer several of them for one request without re-querying.
+    """
+    row = get_db().execute("SELECT plan, status FROM users WHERE email = ?", (email,)).fetchone()
+    return {
+        "plan": row["plan"] if row else "free",
+        "active": bool(row and row["status"] == "active")
+    }
+
+def check_auth_required(email: str, user: Optional[Dict] = None) -> bool:
+    """Check if user requires authentication (new users default to free)."""
+    user = user or fetch_user_context(email)
     return user["plan"] in ("pro", "org")
 
-def get_user_plan(email: str) -> str:
+def get_user_plan(email: str, user: Optional[Dict] = None) -> str:
     """Get user's plan tier."""
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT plan FROM users WHERE email = ?", (email,))
-    user = cursor.fetchone()
-    conn.close()
-    
-    return user["plan"] if user else "free"
+    user = user or fetch_user_context(email)
+    return user["plan"]
 
-def can_access_feature(email: str, feature: str, config: Dict) -> bool:
-    """Check if user can access a feature based on plan."""
-    plan = get_user_plan(email)
-    plan_config = config.get("plans", {}).get(plan, {})
-    
-    feature_map = {
+# One bit per plan-gated feature
+FEATURE_BITS = {
+    feature: 1 << bit
+    for bit, feature in enumerate(("sms", "calendar_ics", "advanced_keywords", "team_features", "priority_support"))
+}
+
+_plan_masks_for = (None, {})  # (config, {plan: feature mask}) for the last config seen
+
+def _plan_mask(plan: str, plan_config: Dict) -> int:
+    """Feature bitmask for one plan."""
+    enabled = {
         "sms": "sms" in plan_config.get("channels", []),
         "calendar_ics": plan != "free",
         "advanced_keywords": plan_config.get("keyword_logic") == "advanced",
         "team_features": plan_config.get("team_features", False),
         "priority_support": plan_config.get("support_level") == "priority"
     }
-    
-    return feature_map.get(feature, False)
+    return sum(FEATURE_BITS[feature] for feature, on in enabled.items() if on)
+
+def _plan_masks(config: Dict) -> Dict[str, int]:
+    """Per-plan masks, rebuilt only when a different config object is passed in."""
+    global _plan_masks_for
+    cached_config, masks = _plan_masks_for
+    if cached_config is not config:
+        masks = {plan: _plan_mask(plan, plan_config) for plan, plan_config in config.get("plans", {}).items()}
+        _plan_masks_for = (config, masks)
+    return masks
+
+def can_access_feature(email: str, feature: str, config: Dict, user: Optional[Dict] = None) -> bool:
+    """Check if user can access a feature based on plan."""
+    plan = get_user_plan(email, user)
+    mask = _plan_masks(config).get(plan)
+    if mask is None:
+        mask = _plan_mask(plan, {})  # Plan missing from config
+    return bool(mask & FEATURE_BITS.get(feature, 0))
 
 if __name__ == "__main__":
     # Test
@@ -138,13 +216,11 @@ if __name__ == "__main__":
     
     # Create test pro user
     conn = get_db()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT OR REPLACE INTO users (id, email, plan, status)
-        VALUES ('test123', 'test@example.com', 'pro', 'active')
-    """)
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO users (id, email, plan, status)
+            VALUES ('test123', 'test@example.com', 'pro', 'active')
+        """)
     
     link = generate_magic_link("test@example.com")
     print(f"Magic link: {link}")
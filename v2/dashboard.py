@@ -4,16 +4,28 @@ V2 Dashboard Server - Complete with all tracking features
 Fixed encoding, comprehensive stats
 """
 
+import gzip
+import hashlib
 import json
 import logging
 import os
+import queue
 import sqlite3
 import sys
-from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -30,12 +42,155 @@ logger = logging.getLogger(__name__)
 DB_PATH = Path(__file__).parent.parent / "data" / "v2" / "la_agenda_v2.db"
 V1_SENT_LOG = Path(__file__).parent.parent / "data" / "state" / "alerts_sent.json"
 
+# Aggregate endpoints are polled by the dashboard and by monitors; serve
+# their encoded JSON from memory for a few seconds
+STATS_TTL = 10
+PUBLIC_STATUS_TTL = 30
+SOURCES_TTL = 2  # One row per source; every open tab polls it
+
+# run_server also refreshes both in the background, so requests rarely
+# have to compute them
+SUMMARY_REFRESH_SECONDS = 5
+
+# API JSON is gzipped for clients that accept it; level 1 gets most of the
+# size win for JSON at a fraction of the CPU
+GZIP_LEVEL = 1
+GZIP_MIN_BYTES = 256
+
+# Browsers may reuse uncached JSON this long, e.g. across open tabs; cached
+# endpoints advertise their remaining TTL instead
+API_MAX_AGE = 2
+
+_CACHE = {}  # endpoint -> (monotonic time, JSON bytes, gzipped JSON bytes, ETag)
+_CACHE_LOCK = threading.Lock()
+
+# Dashboard queries, kept as module constants so each pooled connection's
+# statement cache keeps the prepared statements
+_SQL_STATS = """
+    SELECT
+        (SELECT COUNT(*) FROM users),
+        (SELECT json_group_object(plan, count)
+         FROM (SELECT plan, COUNT(*) AS count FROM users GROUP BY plan)),
+        (SELECT COUNT(*) FROM alerts_sent WHERE sent_at > datetime('now', '-1 day')),
+        (SELECT COUNT(*) FROM alerts_sent WHERE sent_at > datetime('now', '-7 days')),
+        (SELECT COUNT(*) FROM alerts_sent),
+        (SELECT COUNT(*) FROM system_events WHERE event_type = 'error' AND created_at > datetime('now', '-7 days')),
+        (SELECT COUNT(*) FROM outreach_log),
+        (SELECT COUNT(*) FROM outreach_log WHERE sent_at >= date('now') AND sent_at < date('now', '+1 day')),
+        (SELECT COUNT(*) FROM source_health WHERE status = 'healthy'),
+        (SELECT COUNT(*) FROM source_health)
+"""
+
+_SQL_EMAILS = """
+    SELECT id, user_id as email, source_id, title, sent_at, status, retry_count
+    FROM alerts_sent
+    ORDER BY sent_at DESC
+    LIMIT 50
+"""
+
+_SQL_REPLIES = """
+    SELECT email, status, sent_at as timestamp
+    FROM outreach_log
+    WHERE status IN ('replied', 'bounced')
+    ORDER BY sent_at DESC
+    LIMIT 20
+"""
+
+# SQLite builds the whole JSON array itself; the aggregate keeps the
+# subquery's row order
+_SQL_SOURCES = """
+    SELECT json_group_array(json_object(
+        'source_id', source_id, 'name', name, 'status', status,
+        'success_rate', success_rate, 'last_check', last_check,
+        'last_success', last_success, 'failure_count', failure_count))
+    FROM (SELECT * FROM source_health ORDER BY success_rate DESC)
+"""
+
+_SQL_OUTREACH = """
+    SELECT email, domain, status, sent_at, justification
+    FROM outreach_log 
+    ORDER BY sent_at DESC 
+    LIMIT 50
+"""
+
+_SQL_USERS = """
+    SELECT id, email, plan, status, created_at, last_login
+    FROM users
+    ORDER BY created_at DESC
+"""
+
+_SQL_PUBLIC_SOURCES = "SELECT source_id, name, status, last_success FROM source_health"
+
+# /api/stats has a fixed shape of ints, a status word, a timestamp and the
+# plan -> count map (which SQLite returns as JSON already)
+_STATS_TEMPLATE = (
+    '{{"users":{{"total":{users_total},"by_tier":{users_by_tier}}},'
+    '"alerts":{{"24h":{alerts_24h},"7d":{alerts_7d},"total":{alerts_total}}},'
+    '"outreach":{{"total":{outreach_total},"today":{outreach_today}}},'
+    '"sources":{{"total":{sources_total},"healthy":{sources_healthy}}},'
+    '"failed_scrapes":{failed_scrapes},"system_status":"{system_status}","updated_at":"{updated_at}"}}'
+)
+
+def _dumps(obj) -> bytes:
+    """Encode a response body as JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _tail_lines(path, n, chunk_size=8192):
+    """Last n lines of a file, read backwards in chunks from the end."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b''
+        # n + 1 newlines guarantees the first of the last n lines is complete
+        while pos > 0 and buf.count(b'\n') <= n:
+            size = min(chunk_size, pos)
+            pos -= size
+            f.seek(pos)
+            buf = f.read(size) + buf
+    return [line.decode('utf-8', errors='replace') for line in buf.splitlines()[-n:]]
+
+def _dict_rows(cursor):
+    """All remaining rows of a query as dicts keyed by column name."""
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+def _cache_put(key, body):
+    """Store JSON bytes (and a gzipped copy) as the cached response for key."""
+    # Weak ETag: the same validator covers the plain and gzipped bodies
+    etag = 'W/"%s"' % hashlib.md5(body).hexdigest()
+    entry = (time.monotonic(), body, gzip.compress(body, GZIP_LEVEL), etag)
+    with _CACHE_LOCK:
+        _CACHE[key] = entry
+    return entry
+
 class V2DashboardHandler(BaseHTTPRequestHandler):
     """V2 Dashboard API handler."""
     
+    # Keep-alive, so the page's parallel API fetches share connections;
+    # every response therefore carries a Content-Length or is chunked
+    protocol_version = 'HTTP/1.1'
+    # TCP_NODELAY on each connection: small header/body writes and chunked
+    # frames go out immediately instead of waiting on Nagle + delayed ACK
+    disable_nagle_algorithm = True
+    # Buffer writes so headers and body leave in one send() (the server
+    # flushes after each request); streamed JSON goes out per 64 KB
+    wbufsize = 64 * 1024
+    
     def log_message(self, format, *args):
         logger.info(format % args)
     
+    # Set by do_HEAD: send a GET's headers but no body
+    _head_only = False
+    
+    def do_HEAD(self):
+        """Like GET without the body; uncached queries are skipped entirely."""
+        self._head_only = True
+        try:
+            self.do_GET()
+        finally:
+            self._head_only = False  # The handler serves every request on a kept-alive connection
+    
     def do_GET(self):
         parsed = urlparse(self.path)
         path = parsed.path
@@ -57,57 +212,76 @@ class V2DashboardHandler(BaseHTTPRequestHandler):
         handler = routes.get(path, self._send_404)
         handler()
     
-    def _get_db(self):
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+    # Read-only connections reused across requests; the dashboard never writes
+    pool = queue.LifoQueue(maxsize=8)
+    
+    @staticmethod
+    def _connect():
+        # Plain tuple rows; handlers zip them with the column names once per query
+        conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True, check_same_thread=False,
+                               cached_statements=256)
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")  # Read hot pages straight from the OS cache
         return conn
     
+    @classmethod
+    @contextmanager
+    def _db(cls):
+        """Borrow a pooled connection for the duration of a request."""
+        try:
+            conn = cls.pool.get_nowait()
+        except queue.Empty:
+            conn = cls._connect()
+        try:
+            yield conn
+        finally:
+            try:
+                cls.pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
     def _serve_dashboard(self):
-        """Serve main dashboard HTML."""
-        html = self._generate_html()
-        self._send_response(200, 'text/html', html.encode('utf-8'))
+        """Serve main dashboard HTML (pre-encoded, gzipped when accepted)."""
+        headers = {'Cache-Control': 'public, max-age=300', 'Vary': 'Accept-Encoding'}
+        if self._accepts_gzip():
+            headers.update({'Content-Encoding': 'gzip', 'ETag': f'"{_HTML_ETAG}-gz"'})
+            body = _HTML_GZ
+        else:
+            headers['ETag'] = f'"{_HTML_ETAG}"'
+            body = _HTML_BYTES
+        
+        if not self._not_modified(headers):
+            self._send_response(200, 'text/html; charset=utf-8', body, headers)
+    
+    def _serve_cached(self, key, ttl, build):
+        """Serve the JSON bytes from build(), reusing them for ttl seconds."""
+        now = time.monotonic()
+        hit = _CACHE.get(key)
+        if hit is None or now - hit[0] >= ttl:
+            if self._head_only:
+                # Length unknown without running the aggregation; omit it
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
+            hit = _cache_put(key, build())
+        headers = {'ETag': hit[3], 'Cache-Control': 'max-age=%d' % max(0, ttl - int(now - hit[0]))}
+        if not self._not_modified(headers):
+            self._send_json(hit[1], gzipped=hit[2], headers=headers)
     
     def _serve_stats(self):
         """Serve comprehensive dashboard statistics."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        # Users by tier
-        cursor.execute("SELECT plan, COUNT(*) as count FROM users GROUP BY plan")
-        users_by_tier = {row["plan"]: row["count"] for row in cursor.fetchall()}
-        
-        # Alerts sent (24h / 7d / all time)
-        day_ago = (datetime.now() - timedelta(days=1)).isoformat()
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
-        
-        cursor.execute("SELECT COUNT(*) FROM alerts_sent WHERE sent_at > ?", (day_ago,))
-        alerts_24h = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM alerts_sent WHERE sent_at > ?", (week_ago,))
-        alerts_7d = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM alerts_sent")
-        alerts_total = cursor.fetchone()[0]
-        
-        # Failed scrapes
-        cursor.execute("SELECT COUNT(*) FROM system_events WHERE event_type = 'error' AND created_at > ?", (week_ago,))
-        failed_scrapes = cursor.fetchone()[0]
-        
-        # Outreach stats
-        cursor.execute("SELECT COUNT(*) FROM outreach_log")
-        outreach_total = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM outreach_log WHERE date(sent_at) = date('now')")
-        outreach_today = cursor.fetchone()[0]
-        
-        # Source health
-        cursor.execute("SELECT COUNT(*) FROM source_health WHERE status = 'healthy'")
-        sources_healthy = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM source_health")
-        sources_total = cursor.fetchone()[0]
-        
-        conn.close()
+        self._serve_cached('stats', STATS_TTL, self._build_stats)
+    
+    @classmethod
+    def _build_stats(cls):
+        with cls._db() as conn:
+            # Users (total and by tier, the latter already as JSON), alerts
+            # sent (24h / 7d / all time), failed scrapes, outreach and source
+            # health counters in one statement
+            (users_total, users_by_tier, alerts_24h, alerts_7d, alerts_total, failed_scrapes,
+             outreach_total, outreach_today, sources_healthy, sources_total) = conn.execute(_SQL_STATS).fetchone()
         
         # Calculate system health
         if sources_healthy == sources_total and failed_scrapes == 0:
@@ -117,169 +291,100 @@ class V2DashboardHandler(BaseHTTPRequestHandler):
         else:
             system_status = "degraded"
         
-        stats = {
-            "users": {
-                "total": sum(users_by_tier.values()),
-                "by_tier": users_by_tier
-            },
-            "alerts": {
-                "24h": alerts_24h,
-                "7d": alerts_7d,
-                "total": alerts_total
-            },
-            "outreach": {
-                "total": outreach_total,
-                "today": outreach_today
-            },
-            "sources": {
-                "total": sources_total,
-                "healthy": sources_healthy
-            },
-            "failed_scrapes": failed_scrapes,
-            "system_status": system_status,
-            "updated_at": datetime.now().isoformat()
-        }
-        
-        self._send_response(200, 'application/json', json.dumps(stats).encode())
+        return _STATS_TEMPLATE.format(
+            users_total=users_total,
+            users_by_tier=users_by_tier,
+            alerts_24h=alerts_24h,
+            alerts_7d=alerts_7d,
+            alerts_total=alerts_total,
+            outreach_total=outreach_total,
+            outreach_today=outreach_today,
+            sources_total=sources_total,
+            sources_healthy=sources_healthy,
+            failed_scrapes=failed_scrapes,
+            system_status=system_status,
+            updated_at=datetime.now().isoformat()
+        ).encode()
     
     def _serve_emails(self):
         """Serve sent emails history."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, user_id as email, source_id, title, sent_at, status, retry_count
-            FROM alerts_sent
-            ORDER BY sent_at DESC
-            LIMIT 50
-        """)
-        
-        emails = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        self._send_response(200, 'application/json', json.dumps(emails).encode())
+        self._stream_rows(_SQL_EMAILS)
     
     def _serve_replies(self):
         """Serve email replies."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT email, status, sent_at as timestamp
-            FROM outreach_log
-            WHERE status IN ('replied', 'bounced')
-            ORDER BY sent_at DESC
-            LIMIT 20
-        """)
-        
-        replies = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        self._send_response(200, 'application/json', json.dumps(replies).encode())
+        self._stream_rows(_SQL_REPLIES)
     
     def _serve_leads(self):
         """Serve pending leads."""
         leads_file = Path.home() / "Downloads" / "outreach_leads.txt"
-        processed_file = Path.home() / "Downloads" / "outreach_processed.txt"
         
         leads = []
         if leads_file.exists():
-            with open(leads_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        leads.append(line)
+            stripped = (line.strip() for line in leads_file.read_text().splitlines())
+            leads = [line for line in stripped if line and not line.startswith('#')]
         
-        self._send_response(200, 'application/json', json.dumps(leads).encode())
+        self._send_json(_dumps(leads))
     
     def _serve_sources(self):
         """Serve source health data."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT source_id, name, status, success_rate, 
-                   last_check, last_success, failure_count
-            FROM source_health
-            ORDER BY success_rate DESC
-        """)
-        
-        sources = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        self._send_response(200, 'application/json', json.dumps(sources).encode())
+        self._serve_cached('sources', SOURCES_TTL, self._build_sources)
+    
+    @classmethod
+    def _build_sources(cls):
+        with cls._db() as conn:
+            return conn.execute(_SQL_SOURCES).fetchone()[0].encode()
     
     def _serve_outreach(self):
         """Serve outreach activity."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT email, domain, status, sent_at, justification
-            FROM outreach_log 
-            ORDER BY sent_at DESC 
-            LIMIT 50
-        """)
-        
-        logs = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        self._send_response(200, 'application/json', json.dumps(logs).encode())
+        self._stream_rows(_SQL_OUTREACH)
     
     def _serve_logs(self):
         """Serve recent logs."""
         logs = []
         log_files = ['v2_pipeline.log', 'v2_health.log', 'email.log', 'outreach.log']
         
+        # The files' sizes and mtimes identify the response
+        versions = []
         for log_file in log_files:
-            log_path = LOGS_DIR / log_file
-            if log_path.exists():
-                try:
-                    with open(log_path) as f:
-                        lines = f.readlines()
-                        for line in lines[-20:]:
-                            logs.append({"source": log_file, "line": line.strip()})
-                except:
-                    pass
-        
-        self._send_response(200, 'application/json', json.dumps(logs[-50:]).encode())
+            try:
+                st = (LOGS_DIR / log_file).stat()
+            except OSError:
+                continue
+            versions.append((log_file, st.st_mtime_ns, st.st_size))
+        headers = {'ETag': 'W/"%s"' % hashlib.md5(repr(versions).encode()).hexdigest()}
+        if self._not_modified(headers):
+            return
+        
+        for log_file, _, _ in versions:
+            try:
+                for line in _tail_lines(LOGS_DIR / log_file, 20):
+                    logs.append({"source": log_file, "line": line.strip()})
+            except:
+                pass
+        
+        self._send_json(_dumps(logs[-50:]), headers=headers)
     
     def _serve_users(self):
         """Serve user list."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT id, email, plan, status, created_at, last_login
-            FROM users
-            ORDER BY created_at DESC
-        """)
-        
-        users = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        self._send_response(200, 'application/json', json.dumps(users).encode())
+        self._stream_rows(_SQL_USERS)
     
     def _serve_health(self):
         """Serve system health."""
         health = {"status": "healthy", "timestamp": datetime.now().isoformat()}
-        self._send_response(200, 'application/json', json.dumps(health).encode())
+        self._send_json(_dumps(health))
     
     def _serve_public_status(self):
         """Serve public system status."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM source_health WHERE status = 'healthy'")
-        healthy = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM source_health")
-        total = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT source_id, name, status, last_success FROM source_health")
-        sources = [dict(row) for row in cursor.fetchall()]
+        self._serve_cached('public_status', PUBLIC_STATUS_TTL, self._build_public_status)
+    
+    @classmethod
+    def _build_public_status(cls):
+        with cls._db() as conn:
+            sources = _dict_rows(conn.execute(_SQL_PUBLIC_SOURCES))
         
-        conn.close()
+        # Counted from the rows instead of two more COUNT queries
+        total = len(sources)
+        healthy = sum(1 for source in sources if source["status"] == "healthy")
         
         status = "operational" if healthy == total else "degraded" if healthy >= total * 0.7 else "major_outage"
         
@@ -291,22 +396,92 @@ class V2DashboardHandler(BaseHTTPRequestHandler):
             "updated_at": datetime.now().isoformat()
         }
         
-        self._send_response(200, 'application/json', json.dumps(public_status).encode())
+        return _dumps(public_status)
+    
+    def _stream_rows(self, sql, batch_size=256):
+        """Run a query and write its rows as a JSON array, one batch at a time."""
+        if self._head_only:
+            self._send_stream_headers()  # Headers only; don't run the query
+            return
+        
+        with self._db() as conn:
+            cursor = conn.execute(sql)
+            compressor = self._send_stream_headers()
+            
+            def write(data, final=False):
+                if compressor is not None:
+                    data = compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            
+            columns = [d[0] for d in cursor.description]
+            prefix = b'['
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                write(prefix + b','.join(_dumps(dict(zip(columns, row))) for row in rows))
+                prefix = b','
+        write(b'[]' if prefix == b'[' else b']', final=True)
+        self.wfile.write(b'0\r\n\r\n')
+    
+    def _send_stream_headers(self):
+        """Headers for a chunked JSON stream; returns a gzip compressor if negotiated."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Cache-Control', f'max-age={API_MAX_AGE}')
+        self.send_header('Vary', 'Accept-Encoding')
+        # Each batch is compressed and flushed as it goes, so streaming still works
+        compressor = None
+        if self._accepts_gzip():
+            self.send_header('Content-Encoding', 'gzip')
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        self.end_headers()
+        return compressor
+    
+    def _accepts_gzip(self):
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+    
+    def _send_json(self, body, gzipped=None, headers=None):
+        """Send a JSON body, gzipped when the client accepts it and it's worth it."""
+        headers = dict(headers or {}, Vary='Accept-Encoding')
+        if len(body) >= GZIP_MIN_BYTES and self._accepts_gzip():
+            body = gzipped if gzipped is not None else gzip.compress(body, GZIP_LEVEL)
+            headers['Content-Encoding'] = 'gzip'
+        self._send_response(200, 'application/json', body, headers)
+    
+    def _not_modified(self, headers):
+        """Answer 304 if the client already has this ETag; returns whether it did."""
+        if self.headers.get('If-None-Match') != headers['ETag']:
+            return False
+        self.send_response(304)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        return True
     
-    def _send_response(self, code, content_type, data):
+    def _send_response(self, code, content_type, data, headers=None):
         self.send_response(code)
         self.send_header('Content-Type', content_type)
         self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(data)
+        if not self._head_only:
+            self.wfile.write(data)
     
     def _send_404(self):
         self.send_response(404)
         self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '9')
         self.end_headers()
-        self.wfile.write(b'Not Found')
+        if not self._head_only:
+            self.wfile.write(b'Not Found')
     
-    def _generate_html(self):
+    @staticmethod
+    def _generate_html():
         return '''<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -672,9 +847,32 @@ class V2DashboardHandler(BaseHTTPRequestHandler):
 </body>
 </html>'''
 
+# The dashboard page never changes at runtime; encode and compress it once
+_HTML_BYTES = V2DashboardHandler._generate_html().encode('utf-8')
+_HTML_GZ = gzip.compress(_HTML_BYTES, 9)
+_HTML_ETAG = hashlib.md5(_HTML_BYTES).hexdigest()
+
+def _refresh_summaries():
+    """Recompute the cached stats and public status until the process exits."""
+    while True:
+        for key, build in (('stats', V2DashboardHandler._build_stats),
+                           ('public_status', V2DashboardHandler._build_public_status)):
+            try:
+                _cache_put(key, build())
+            except sqlite3.Error as e:
+                logger.warning(f"Summary refresh failed for {key}: {e}")
+        time.sleep(SUMMARY_REFRESH_SECONDS)
+
 def run_server(port=8080):
     server_address = ('', port)
-    httpd = HTTPServer(server_address, V2DashboardHandler)
+    httpd = ThreadingHTTPServer(server_address, V2DashboardHandler)
+    
+    # Open a connection up front, before the first request
+    try:
+        V2DashboardHandler.pool.put_nowait(V2DashboardHandler._connect())
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Database not available yet: {e}")
+    threading.Thread(target=_refresh_summaries, name="summary-refresh", daemon=True).start()
     logger.info(f"V2 Dashboard running at http://localhost:{port}")
     print(f"\n🚀 V2 Dashboard: http://localhost:{port}")
     print("Press Ctrl+C to stop\n")
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+V2 Database Connections - One SQLite connection per thread and database
+The notifier, outreach, health monitor and auth modules share these instead
+of each opening (and tuning) their own.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+_local = threading.local()
+
+def get_db(db_path: Path) -> sqlite3.Connection:
+    """
+    Return this thread's connection to db_path, opening it on first use.
+
+    The connection stays open for the thread's lifetime and is shared by
+    every module in it; callers must not close it, and wrap writes in
+    `with conn:` to commit them.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+        conn.execute("PRAGMA mmap_size=268435456")
+        conns[db_path] = conn
+    return conn
@@ -5,10 +5,16 @@ V2 Health Monitoring - Source reliability tracking
 
 import json
 import logging
-import sqlite3
-from datetime import datetime, timedelta
+import re
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import db_pool
+except ImportError:  # Imported as v2.<module>
+    from v2 import db_pool
 
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -24,6 +30,9 @@ logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent / "data" / "v2" / "la_agenda_v2.db"
 
+# Errors worth auto-tagging: PDF parse failures, timeouts/connection errors, 404/403
+_AUTO_TAG_RE = re.compile(r'pdf.*parse|parse.*pdf|timeout|connection|40[34]', re.IGNORECASE | re.DOTALL)
+
 class HealthMonitor:
     """Monitor system and source health."""
     
@@ -31,51 +40,48 @@ class HealthMonitor:
         self.threshold = 0.8  # 80% success rate threshold
     
     def _get_db(self):
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's database connection."""
+        return db_pool.get_db(DB_PATH)
     
     def record_source_check(self, source_id: str, success: bool, 
                            response_time_ms: int = 0, error: str = None):
         """Record a source check result."""
+        self.record_source_checks([(source_id, success, response_time_ms, error)])
+    
+    def record_source_checks(self, results: List[Tuple[str, bool, int, Optional[str]]]):
+        """Record (source_id, success, response_time_ms, error) results in one transaction."""
         conn = self._get_db()
-        cursor = conn.cursor()
-        
         now = datetime.now().isoformat()
         
-        if success:
-            cursor.execute("""
-                UPDATE source_health 
-                SET last_check = ?, last_success = ?, success_count = success_count + 1,
-                    failure_count = 0, status = 'healthy', avg_response_time_ms = ?,
-                    last_error = NULL
-                WHERE source_id = ?
-            """, (now, now, response_time_ms, source_id))
-        else:
-            cursor.execute("""
-                UPDATE source_health 
-                SET last_check = ?, failure_count = failure_count + 1,
-                    last_error = ?, status = 
-                    CASE 
-                        WHEN failure_count >= 2 THEN 'down'
-                        WHEN failure_count >= 1 THEN 'degraded'
-                        ELSE 'healthy'
-                    END
-                WHERE source_id = ?
-            """, (now, error, source_id))
-        
-        # Update success rate
-        cursor.execute("""
-            UPDATE source_health 
-            SET success_rate = CAST(success_count AS REAL) / (success_count + failure_count)
-            WHERE source_id = ?
-        """, (source_id,))
-        
-        conn.commit()
-        conn.close()
-        
-        status = "✅" if success else "❌"
-        logger.info(f"{status} Source {source_id}: {'OK' if success else error}")
+        # The new success_rate is computed from the pre-update counters, so one
+        # statement covers both the counters and the ratio
+        with conn:
+            for source_id, success, response_time_ms, error in results:
+                if success:
+                    conn.execute("""
+                        UPDATE source_health 
+                        SET last_check = ?, last_success = ?, success_count = success_count + 1,
+                            failure_count = 0, status = 'healthy', avg_response_time_ms = ?,
+                            last_error = NULL, success_rate = 1.0
+                        WHERE source_id = ?
+                    """, (now, now, response_time_ms, source_id))
+                else:
+                    conn.execute("""
+                        UPDATE source_health 
+                        SET last_check = ?, failure_count = failure_count + 1,
+                            last_error = ?, status = 
+                            CASE 
+                                WHEN failure_count >= 2 THEN 'down'
+                                WHEN failure_count >= 1 THEN 'degraded'
+                                ELSE 'healthy'
+                            END,
+                            success_rate = CAST(success_count AS REAL) / (success_count + failure_count + 1)
+                        WHERE source_id = ?
+                    """, (now, error, source_id))
+        
+        for source_id, success, _, error in results:
+            status = "✅" if success else "❌"
+            logger.info(f"{status} Source {source_id}: {'OK' if success else error}")
     
     def get_source_health(self) -> List[Dict]:
         """Get health status for all sources."""
@@ -90,7 +96,6 @@ class HealthMonitor:
         """)
         
         sources = [dict(row) for row in cursor.fetchall()]
-        conn.close()
         
         return sources
     
@@ -98,9 +103,10 @@ class HealthMonitor:
         """Get overall system status for public page."""
         sources = self.get_source_health()
         
-        healthy_count = sum(1 for s in sources if s["status"] == "healthy")
-        degraded_count = sum(1 for s in sources if s["status"] == "degraded")
-        down_count = sum(1 for s in sources if s["status"] == "down")
+        counts = Counter(s["status"] for s in sources)
+        healthy_count = counts["healthy"]
+        degraded_count = counts["degraded"]
+        down_count = counts["down"]
         
         overall_status = "operational"
         if down_count > 0:
@@ -121,46 +127,37 @@ class HealthMonitor:
     def log_system_event(self, event_type: str, component: str, 
                         message: str, details: str = None):
         """Log a system event."""
+        self.log_system_events([(event_type, component, message, details)])
+    
+    def log_system_events(self, events: List[Tuple[str, str, str, Optional[str]]]):
+        """Log (event_type, component, message, details) events in one transaction."""
         conn = self._get_db()
-        cursor = conn.cursor()
         
         # Auto-tag common errors
-        auto_tagged = False
-        if "pdf" in message.lower() and "parse" in message.lower():
-            auto_tagged = True
-        elif "timeout" in message.lower() or "connection" in message.lower():
-            auto_tagged = True
-        elif "404" in message or "403" in message:
-            auto_tagged = True
-        
-        cursor.execute("""
-            INSERT INTO system_events (event_type, component, message, details, auto_tagged)
-            VALUES (?, ?, ?, ?, ?)
-        """, (event_type, component, message, details, auto_tagged))
-        
-        conn.commit()
-        conn.close()
-        
-        logger.info(f"System event: [{event_type}] {component}: {message}")
+        with conn:
+            conn.executemany("""
+                INSERT INTO system_events (event_type, component, message, details, auto_tagged)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(event_type, component, message, details, _AUTO_TAG_RE.search(message) is not None)
+                  for event_type, component, message, details in events])
+        
+        for event_type, component, message, _ in events:
+            logger.info(f"System event: [{event_type}] {component}: {message}")
     
     def generate_weekly_digest(self) -> str:
         """Generate weekly health summary email."""
         conn = self._get_db()
         cursor = conn.cursor()
         
-        # Get alerts sent this week
-        week_ago = (datetime.now() - timedelta(days=7)).isoformat()
+        # Alerts sent and errors logged this week, in one statement; the
+        # cutoff is computed in SQL to match the UTC CURRENT_TIMESTAMP columns
+        now = datetime.now()
         cursor.execute("""
-            SELECT COUNT(*) FROM alerts_sent WHERE sent_at > ?
-        """, (week_ago,))
-        alerts_sent = cursor.fetchone()[0]
-        
-        # Get error count
-        cursor.execute("""
-            SELECT COUNT(*) FROM system_events 
-            WHERE event_type = 'error' AND created_at > ?
-        """, (week_ago,))
-        error_count = cursor.fetchone()[0]
+            SELECT (SELECT COUNT(*) FROM alerts_sent WHERE sent_at > datetime('now', '-7 days')),
+                   (SELECT COUNT(*) FROM system_events 
+                    WHERE event_type = 'error' AND created_at > datetime('now', '-7 days'))
+        """)
+        alerts_sent, error_count = cursor.fetchone()
         
         # Get source issues
         cursor.execute("""
@@ -169,12 +166,10 @@ class HealthMonitor:
         """)
         issues = cursor.fetchall()
         
-        conn.close()
-        
         # Build digest
         digest = f"""📊 LA Agenda Alerts - Weekly Health Report
 
-Week of {datetime.now().strftime("%Y-%m-%d")}
+Week of {now:%Y-%m-%d}
 
 ALERTS SENT: {alerts_sent}
 ERRORS LOGGED: {error_count}
@@ -183,11 +178,12 @@ SOURCE STATUS:
 """
         
         if issues:
-            for issue in issues:
-                digest += f"⚠️ {issue['source_id']}: {issue['status']}"
-                if issue['last_error']:
-                    digest += f" - {issue['last_error'][:50]}..."
-                digest += "\n"
+            digest += "".join(
+                f"⚠️ {issue['source_id']}: {issue['status']}"
+                + (f" - {issue['last_error'][:50]}..." if issue['last_error'] else "")
+                + "\n"
+                for issue in issues
+            )
         else:
             digest += "✅ All sources healthy\n"
         
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+V2 Shared HTTP Client - One connection pool per process
+Outreach, notifications, Stripe API calls and callbacks reuse the same
+keep-alive connections instead of each paying DNS + TLS setup.
+"""
+
+import asyncio
+import threading
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 -- enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 60.0
+CONNECT_RETRIES = 3
+
+_client = None
+_client_loop = None
+_sync_client = None
+_sync_lock = threading.Lock()
+
+def _limits():
+    return httpx.Limits(max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY)
+
+def get_client():
+    """
+    Return the process-wide blocking httpx.Client (None without httpx).
+
+    For synchronous callers such as the Stripe server. httpx.Client is
+    thread-safe, so every thread shares one pool. Failed connects are
+    retried by the transport.
+    """
+    global _sync_client
+    if httpx is None:
+        return None
+
+    with _sync_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(
+                transport=httpx.HTTPTransport(http2=HTTP2_AVAILABLE, limits=_limits(),
+                                              retries=CONNECT_RETRIES),
+                timeout=httpx.Timeout(30.0, connect=5.0),
+            )
+        return _sync_client
+
+def close_client():
+    """Close the shared blocking client, if one was made."""
+    global _sync_client
+    with _sync_lock:
+        client, _sync_client = _sync_client, None
+    if client is not None:
+        client.close()
+
+def get_async_client():
+    """
+    Return the process-wide httpx.AsyncClient (None without httpx).
+
+    Must be called from a coroutine. An async client is tied to the event
+    loop that created it, so a new one is made for each asyncio.run();
+    call aclose_async_client() before that loop ends.
+    """
+    global _client, _client_loop
+    if httpx is None:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=_limits(),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
+        _client_loop = loop
+    return _client
+
+async def aclose_async_client():
+    """Close the shared client if this loop owns it."""
+    global _client, _client_loop
+    client = _client
+    if client is not None and _client_loop is asyncio.get_running_loop():
+        _client = _client_loop = None
+        await client.aclose()
@@ -5,22 +5,40 @@ V2 Database Setup - SQLite with WAL mode for reliability
 
 import json
 import sqlite3
+import uuid
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 DATA_DIR = Path(__file__).parent.parent / "data" / "v2"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 DB_PATH = DATA_DIR / "la_agenda_v2.db"
 
+def _load_json(path: Path):
+    """Read a JSON file (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
 def init_database():
     """Initialize SQLite database with all V2 tables."""
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    # Match the OS page size; only takes effect while the file is still empty
+    cursor.execute("PRAGMA page_size=4096")
+    
     # Enable WAL mode for better concurrency
     cursor.execute("PRAGMA journal_mode=WAL")
     cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-8192")  # 8 MB
     
     # Users table
     cursor.execute("""
@@ -122,6 +140,17 @@ def init_database():
         )
     """)
     
+    # Indexes for the dashboard's time-window filters and orderings
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_sent_at ON alerts_sent(sent_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sysevt_type_ctime ON system_events(event_type, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_outreach_sent_at ON outreach_log(sent_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_srcheal_status ON source_health(status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_srcheal_success_rate ON source_health(success_rate)")
+    
+    # Notifier queue and outreach dedupe lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status_retry ON alerts_sent(status, retry_count)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_outreach_email ON outreach_log(email)")
+    
     conn.commit()
     conn.close()
     print(f"✅ V2 Database initialized: {DB_PATH}")
@@ -134,40 +163,39 @@ def migrate_v1_users():
         print("⚠️ No V1 subscribers to migrate")
         return
     
-    with open(v1_subscribers) as f:
-        data = json.load(f)
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    data = _load_json(v1_subscribers)
     
-    migrated = 0
+    user_rows = []
+    pref_rows = []
     for sub in data.get("subscribers", []):
         try:
-            import uuid
-            user_id = str(uuid.uuid4())[:8]
-            
-            cursor.execute("""
-                INSERT OR IGNORE INTO users (id, email, plan, status)
-                VALUES (?, ?, 'free', 'active')
-            """, (user_id, sub["email"]))
-            
-            cursor.execute("""
-                INSERT OR IGNORE INTO preferences (user_id, keywords, sources, frequency)
-                VALUES (?, ?, ?, ?)
-            """, (
+            user_id = uuid.uuid4().hex[:8]
+            user_row = (user_id, sub["email"])
+            pref_row = (
                 user_id,
                 json.dumps(sub.get("keywords", [])),
                 json.dumps(sub.get("sources", ["city_council", "county_bos", "plum_committee"])),
                 sub.get("frequency", "instant")
-            ))
-            
-            migrated += 1
+            )
         except Exception as e:
             print(f"⚠️ Failed to migrate {sub.get('email')}: {e}")
+            continue
+        user_rows.append(user_row)
+        pref_rows.append(pref_row)
     
-    conn.commit()
+    # One transaction for the whole batch instead of a commit per row
+    conn = sqlite3.connect(DB_PATH)
+    with conn:
+        conn.executemany("""
+            INSERT OR IGNORE INTO users (id, email, plan, status)
+            VALUES (?, ?, 'free', 'active')
+        """, user_rows)
+        conn.executemany("""
+            INSERT OR IGNORE INTO preferences (user_id, keywords, sources, frequency)
+            VALUES (?, ?, ?, ?)
+        """, pref_rows)
     conn.close()
-    print(f"✅ Migrated {migrated} V1 subscribers")
+    print(f"✅ Migrated {len(user_rows)} V1 subscribers")
 
 def init_source_health():
     """Initialize source health tracking."""
@@ -177,19 +205,14 @@ def init_source_health():
         print("⚠️ No sources.json found")
         return
     
-    with open(sources_path) as f:
-        data = json.load(f)
+    data = _load_json(sources_path)
     
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    for source in data.get("sources", []):
-        cursor.execute("""
+    with conn:
+        conn.executemany("""
             INSERT OR IGNORE INTO source_health (source_id, name, status)
             VALUES (?, ?, 'healthy')
-        """, (source["id"], source["name"]))
-    
-    conn.commit()
+        """, [(source["id"], source["name"]) for source in data.get("sources", [])])
     conn.close()
     print(f"✅ Initialized {len(data.get('sources', []))} source health trackers")
 
@@ -5,6 +5,7 @@ V2 Migration - Zero-downtime upgrade from V1
 
 import json
 import shutil
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
@@ -12,6 +13,10 @@ PROJECT_DIR = Path(__file__).parent.parent
 V1_DIR = PROJECT_DIR
 V2_DIR = PROJECT_DIR / "v2"
 
+# Tables init_db.init_database creates
+REQUIRED_TABLES = {"users", "preferences", "alerts_sent", "source_health",
+                   "outreach_log", "system_events", "billing_events"}
+
 def check_prerequisites():
     """Check if system is ready for migration."""
     print("🔍 Checking prerequisites...")
@@ -99,6 +104,25 @@ def verify_migration():
         print("❌ Database not created")
         return False
     
+    # A half-written or corrupt file still exists; have SQLite check it
+    try:
+        conn = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+        try:
+            result = conn.execute("PRAGMA quick_check").fetchone()[0]
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        print(f"❌ Database unreadable: {e}")
+        return False
+    if result != "ok":
+        print(f"❌ Database failed quick_check: {result}")
+        return False
+    missing = REQUIRED_TABLES - tables
+    if missing:
+        print(f"❌ Database missing tables: {', '.join(sorted(missing))}")
+        return False
+    
     # Check config
     config_path = PROJECT_DIR / "config" / "v2.json"
     if not config_path.exists():
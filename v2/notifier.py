@@ -8,13 +8,18 @@ import json
 import logging
 import os
 import smtplib
-import sqlite3
 import subprocess
+import time
 from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import db_pool
+except ImportError:  # Imported as v2.<module>
+    from v2 import db_pool
 
 # Setup logging
 LOGS_DIR = Path(__file__).parent.parent / "logs"
@@ -31,6 +36,51 @@ logger = logging.getLogger(__name__)
 
 DB_PATH = Path(__file__).parent.parent / "data" / "v2" / "la_agenda_v2.db"
 
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "v2.json"
+_config_cache: Dict[Path, Tuple[float, Dict]] = {}  # path -> (mtime, parsed config)
+
+SQL_PENDING = """
+    SELECT * FROM alerts_sent 
+    WHERE status IN ('pending', 'retrying')
+    AND retry_count < ?
+    ORDER BY sent_at ASC
+"""
+# Fail queued alerts already at their plan's retry limit; the CASE arms
+# (one "WHEN ? THEN ?" per plan) are filled in from config at init
+SQL_EXPIRE_RETRIES = """
+    UPDATE alerts_sent SET status = 'failed', error_message = 'Max retries exceeded'
+    WHERE status IN ('pending', 'retrying')
+    AND retry_count >= COALESCE(
+        (SELECT CASE plan {} ELSE ? END FROM users WHERE email = alerts_sent.user_id), ?)
+"""
+SQL_MARK_SENT = "UPDATE alerts_sent SET status = 'sent' WHERE id = ?"
+SQL_MARK_FAILED = "UPDATE alerts_sent SET status = 'failed', error_message = ? WHERE id = ?"
+SQL_MARK_RETRY = "UPDATE alerts_sent SET retry_count = retry_count + 1, status = 'retrying' WHERE id = ?"
+
+SMTP_HOST = "smtp.gmail.com"
+SMTP_PORT = 587
+
+# Gmail answers 421/454 when a session sends too much too fast; back off
+# (0.5s, 1s, 2s) and retry on a fresh session
+SMTP_RETRY_CODES = (421, 454)
+SMTP_MAX_RETRIES = 3
+SMTP_BACKOFF_SECONDS = 0.5
+
+# How long to wait, after the emails, for a batch's osascript SMS run:
+# a fixed allowance plus time per message, so big batches aren't cut off
+SMS_TIMEOUT_SECONDS = 30
+SMS_SECONDS_PER_MESSAGE = 5
+
+# (retry attempts, channels) for a plan missing from config
+DEFAULT_PLAN_SETTINGS = (1, ("email",))
+
+# Emails per users lookup; stays under SQLite's 999 bound-parameter limit
+USER_LOOKUP_CHUNK = 900
+
+def _applescript_str(text: str) -> str:
+    """Quote text as an AppleScript string literal."""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
 class V2Notifier:
     """Tier-aware notification system with retry logic."""
     
@@ -38,96 +88,134 @@ class V2Notifier:
         self.gmail_user = os.environ.get("GMAIL_USER")
         self.gmail_password = os.environ.get("GMAIL_APP_PASSWORD")
         self.config = self._load_config()
+        self._plan_cache = self._build_plan_cache()
+        # No plan retries more than this, so the queue SELECT needn't look further
+        self._max_retries = max((retries for retries, _ in self._plan_cache.values()),
+                                default=DEFAULT_PLAN_SETTINGS[0])
+        self._expire_sql, self._expire_params = self._build_expire_query()
+        self._smtp = None  # Logged-in session, shared by a whole batch
+        self._smtp_msgs_sent = 0
+        smtp_config = self.config.get("notifier", {}).get("smtp", {})
+        self.messages_per_connection = smtp_config.get("messages_per_connection", 100)
     
     def _load_config(self) -> Dict:
-        """Load V2 config."""
-        config_path = Path(__file__).parent.parent / "config" / "v2.json"
-        with open(config_path) as f:
-            return json.load(f)
+        """Load V2 config (re-parsed only when the file's mtime changes)."""
+        mtime = CONFIG_PATH.stat().st_mtime
+        cached = _config_cache.get(CONFIG_PATH)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(CONFIG_PATH) as f:
+            config = json.load(f)
+        _config_cache[CONFIG_PATH] = (mtime, config)
+        return config
     
     def _get_db(self):
-        """Get database connection."""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's database connection."""
+        return db_pool.get_db(DB_PATH)
     
-    def _get_user_plan(self, email: str) -> str:
-        """Get user's plan tier."""
+    def _get_users(self, emails) -> Dict[str, Tuple[str, Optional[str]]]:
+        """Map each known email to its (plan, sms_number), a chunk of emails per query."""
+        emails = list(emails)
         conn = self._get_db()
-        cursor = conn.cursor()
-        cursor.execute("SELECT plan FROM users WHERE email = ?", (email,))
-        user = cursor.fetchone()
-        conn.close()
-        return user["plan"] if user else "free"
+        users = {}
+        for i in range(0, len(emails), USER_LOOKUP_CHUNK):
+            chunk = emails[i:i + USER_LOOKUP_CHUNK]
+            rows = conn.execute(f"""
+                SELECT u.email, u.plan, p.sms_number
+                FROM users u LEFT JOIN preferences p ON p.user_id = u.id
+                WHERE u.email IN ({",".join("?" * len(chunk))})
+            """, chunk)
+            users.update((row["email"], (row["plan"], row["sms_number"])) for row in rows)
+        return users
     
-    def _get_retry_attempts(self, plan: str) -> int:
-        """Get retry attempts based on plan."""
-        return self.config.get("reliability", {}).get("retry_attempts", {}).get(plan, 1)
+    def _build_plan_cache(self) -> Dict[str, Tuple[int, Tuple[str, ...]]]:
+        """Map each plan to (retry attempts, channels), read from config once."""
+        retry_attempts = self.config.get("reliability", {}).get("retry_attempts", {})
+        plans = self.config.get("plans", {})
+        return {
+            plan: (retry_attempts.get(plan, 1), tuple(plans.get(plan, {}).get("channels", ["email"])))
+            for plan in set(retry_attempts) | set(plans)
+        }
     
-    def _get_plan_config(self, plan: str) -> Dict:
-        """Get plan configuration."""
-        return self.config.get("plans", {}).get(plan, {})
+    def _build_expire_query(self) -> Tuple[str, tuple]:
+        """SQL_EXPIRE_RETRIES with a CASE arm per plan, and its parameters."""
+        params = []
+        for plan, (retries, _) in sorted(self._plan_cache.items()):
+            params += [plan, retries]
+        # Unknown plans and users without a row get the same limit as in _process_notification
+        params += [DEFAULT_PLAN_SETTINGS[0], self._plan_cache.get("free", DEFAULT_PLAN_SETTINGS)[0]]
+        return SQL_EXPIRE_RETRIES.format(" ".join(["WHEN ? THEN ?"] * len(self._plan_cache))), tuple(params)
     
     def send_pending_notifications(self):
         """Process all pending notifications with retry logic."""
         conn = self._get_db()
         cursor = conn.cursor()
         
+        # Alerts out of retries are failed in SQL, so they're never fetched,
+        # looked up or sent again
+        with conn:
+            expired = conn.execute(self._expire_sql, self._expire_params).rowcount
+        if expired:
+            logger.info(f"Marked {expired} notifications failed (max retries exceeded)")
+        
         # Get pending notifications
-        cursor.execute("""
-            SELECT * FROM alerts_sent 
-            WHERE status IN ('pending', 'retrying')
-            AND retry_count < 5
-            ORDER BY created_at ASC
-        """)
+        cursor.execute(SQL_PENDING, (self._max_retries,))
         
         pending = cursor.fetchall()
-        conn.close()
         
         logger.info(f"Processing {len(pending)} pending notifications")
         
-        for alert in pending:
-            self._process_notification(dict(alert))
-    
-    def _process_notification(self, alert: Dict):
-        """Process a single notification with retries."""
-        email = alert.get("user_id")  # In V2, user_id is email for free users
-        plan = self._get_user_plan(email)
-        max_retries = self._get_retry_attempts(plan)
-        
-        # Check retry limit
-        if alert.get("retry_count", 0) >= max_retries:
-            self._mark_failed(alert["id"], "Max retries exceeded")
-            return
+        # Every recipient's plan and SMS number, fetched up front (in V2,
+        # user_id is the email for free users)
+        users = self._get_users({alert["user_id"] for alert in pending})
         
-        # Get channels for this plan
-        plan_config = self._get_plan_config(plan)
-        channels = plan_config.get("channels", ["email"])
+        alerts = [(dict(alert), *users.get(alert["user_id"], ("free", None))) for alert in pending]
         
-        success = False
+        # Pro+ SMS go out in a single osascript run in the background while
+        # the emails send; an alert counts as sent if either channel delivers
+        sms_jobs = [(alert, sms_number) for alert, plan, sms_number in alerts
+                    if sms_number and self._wants_sms(alert, plan)]
+        sms_batch = self._start_sms_batch(sms_jobs)
         
-        # Try email
-        if "email" in channels and self.gmail_user:
-            if self._send_email(alert):
-                success = True
+        results = []
+        try:
+            for alert, plan, _ in alerts:
+                results.append(self._process_notification(alert, plan))
+        finally:
+            sms_delivered = self._finish_sms_batch(sms_batch, sms_jobs)
+            self._close_smtp()
+            
+            # Outcomes are written together at the end, in one transaction
+            outcomes = {"sent": [], "failed": [], "retry": []}
+            for outcome, alert_id, error in results:
+                if outcome == "retry" and alert_id in sms_delivered:
+                    outcome = "sent"
+                outcomes[outcome].append((error, alert_id) if outcome == "failed" else (alert_id,))
+            self._record_outcomes(outcomes)
+    
+    def _process_notification(self, alert: Dict, plan: str) -> Tuple[str, str, Optional[str]]:
+        """Email a single notification; returns ("sent"|"failed"|"retry", alert id, error)."""
+        max_retries, channels = self._plan_cache.get(plan, DEFAULT_PLAN_SETTINGS)
         
-        # Try SMS for Pro+
-        if not success and "sms" in channels and plan in ("pro", "org"):
-            if self._send_sms(alert):
-                success = True
+        # Check retry limit
+        if alert.get("retry_count", 0) >= max_retries:
+            return "failed", alert["id"], "Max retries exceeded"
         
-        if success:
-            self._mark_sent(alert["id"])
-        else:
-            self._increment_retry(alert["id"])
+        success = "email" in channels and bool(self.gmail_user) and self._send_email(alert, plan)
+        return ("sent" if success else "retry"), alert["id"], None
+    
+    def _wants_sms(self, alert: Dict, plan: str) -> bool:
+        """Whether this alert should also go out by SMS (Pro+, within retry limit)."""
+        max_retries, channels = self._plan_cache.get(plan, DEFAULT_PLAN_SETTINGS)
+        return (alert.get("retry_count", 0) < max_retries
+                and "sms" in channels and plan in ("pro", "org"))
     
-    def _send_email(self, alert: Dict) -> bool:
+    def _send_email(self, alert: Dict, plan: str) -> bool:
         """Send email notification."""
         try:
             subject = f"[LA Agenda] {alert['source_id']}: {alert['change_type']}"
             
             # Add disclaimer for free tier
-            plan = self._get_user_plan(alert.get("user_id", ""))
             disclaimer = ""
             if plan == "free":
                 disclaimer = self.config.get("disclaimers", {}).get("free_tier", "")
@@ -147,11 +235,7 @@ Time: {alert['sent_at']}
             msg['Subject'] = subject
             msg.attach(MIMEText(body, 'plain'))
             
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(self.gmail_user, self.gmail_password)
-            server.send_message(msg)
-            server.quit()
+            self._send_message(msg)
             
             logger.info(f"✅ Email sent to {alert['user_id']}")
             return True
@@ -160,82 +244,119 @@ Time: {alert['sent_at']}
             logger.error(f"❌ Email failed: {e}")
             return False
     
-    def _send_sms(self, alert: Dict) -> bool:
-        """Send SMS via iMessage (Mac only)."""
+    def _send_message(self, msg: MIMEMultipart):
+        """Send over the shared session, reconnecting/backing off on transient errors."""
+        for attempt in range(SMTP_MAX_RETRIES + 1):
+            try:
+                self._get_smtp().send_message(msg)
+                self._smtp_msgs_sent += 1
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Gmail drops idle or long-lived sessions; just reconnect
+                if attempt == SMTP_MAX_RETRIES:
+                    raise
+                self._close_smtp()
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code not in SMTP_RETRY_CODES or attempt == SMTP_MAX_RETRIES:
+                    raise
+                self._close_smtp()
+                time.sleep(SMTP_BACKOFF_SECONDS * 2 ** attempt)
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the logged-in SMTP session, connecting on first use."""
+        # Recycle the session before Gmail's per-connection limit kicks in
+        if self._smtp is not None and self._smtp_msgs_sent >= self.messages_per_connection:
+            self._close_smtp()
+        if self._smtp is None:
+            server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+            try:
+                server.starttls()
+                server.login(self.gmail_user, self.gmail_password)
+            except Exception:
+                server.close()
+                raise
+            self._smtp = server
+            self._smtp_msgs_sent = 0
+        return self._smtp
+    
+    def _close_smtp(self):
+        """Quit the SMTP session, if one is open."""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
         try:
-            # Get SMS number from preferences
-            conn = self._get_db()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT sms_number FROM preferences 
-                WHERE user_id = (SELECT id FROM users WHERE email = ?)
-            """, (alert.get("user_id"),))
-            
-            result = cursor.fetchone()
-            conn.close()
-            
-            if not result or not result["sms_number"]:
-                return False
-            
-            phone = result["sms_number"]
-            message = f"📢 LA Alert: {alert['source_id']} - {alert['title'][:80]}..."
-            
-            script = f'''
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def _start_sms_batch(self, jobs: List[Tuple[Dict, str]]) -> Optional[subprocess.Popen]:
+        """Start one osascript run that sends every (alert, phone) SMS via iMessage (Mac only)."""
+        if not jobs:
+            return None
+        
+        # Each send is tried on its own and logged (to stderr) as soon as it
+        # goes out, so a run that is killed part-way still reports what it sent
+        sends = "".join(f'''
+                try
+                    send {_applescript_str(f"📢 LA Alert: {alert['source_id']} - {alert['title'][:80]}...")} to buddy {_applescript_str(phone)} of targetService
+                    log "sent {i}"
+                end try''' for i, (alert, phone) in enumerate(jobs, 1))
+        script = f'''
             tell application "Messages"
-                set targetService to 1st service whose service type = iMessage
-                set targetBuddy to buddy "{phone}" of targetService
-                send "{message}" to targetBuddy
+                set targetService to 1st service whose service type = iMessage{sends}
             end tell
             '''
-            
-            result = subprocess.run(
+        
+        try:
+            return subprocess.Popen(
                 ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=30
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True
             )
-            
-            if result.returncode == 0:
-                logger.info(f"✅ SMS sent to {phone}")
-                return True
-            return False
-            
-        except Exception as e:
+        except OSError as e:
             logger.error(f"❌ SMS failed: {e}")
-            return False
+            return None
     
-    def _mark_sent(self, alert_id: str):
-        """Mark alert as sent."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE alerts_sent SET status = 'sent' WHERE id = ?",
-            (alert_id,)
-        )
-        conn.commit()
-        conn.close()
-    
-    def _mark_failed(self, alert_id: str, error: str):
-        """Mark alert as failed."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE alerts_sent SET status = 'failed', error_message = ? WHERE id = ?",
-            (error, alert_id)
-        )
-        conn.commit()
-        conn.close()
-    
-    def _increment_retry(self, alert_id: str):
-        """Increment retry count."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE alerts_sent SET retry_count = retry_count + 1, status = 'retrying' WHERE id = ?",
-            (alert_id,)
-        )
-        conn.commit()
-        conn.close()
+    def _finish_sms_batch(self, proc: Optional[subprocess.Popen], jobs: List[Tuple[Dict, str]]) -> Set[str]:
+        """Wait for the SMS run; returns the ids of alerts whose SMS went out."""
+        if proc is None:
+            return set()
+        try:
+            _, err = proc.communicate(timeout=SMS_TIMEOUT_SECONDS + SMS_SECONDS_PER_MESSAGE * len(jobs))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            _, err = proc.communicate()
+            logger.error("❌ SMS failed: osascript timed out")
+        
+        # Whatever was logged as sent counts, even from a killed or failed run
+        sent = set()
+        errors = []
+        for line in err.splitlines():
+            if line.startswith("sent ") and line[5:].isdigit():
+                sent.add(int(line[5:]))
+            elif line.strip():
+                errors.append(line.strip())
+        if proc.returncode != 0 and errors:
+            logger.error(f"❌ SMS failed: {' '.join(errors)}")
+        
+        delivered = set()
+        for i, (alert, phone) in enumerate(jobs, 1):
+            if i in sent:
+                logger.info(f"✅ SMS sent to {phone}")
+                delivered.add(alert["id"])
+            else:
+                logger.error(f"❌ SMS failed: {phone}")
+        return delivered
+    
+    def _record_outcomes(self, outcomes: Dict[str, List[tuple]]):
+        """Write a batch's sent/failed/retry results in a single transaction."""
+        if not any(outcomes.values()):
+            return
+        with self._get_db() as conn:
+            conn.executemany(SQL_MARK_SENT, outcomes["sent"])
+            conn.executemany(SQL_MARK_FAILED, outcomes["failed"])
+            conn.executemany(SQL_MARK_RETRY, outcomes["retry"])
 
 if __name__ == "__main__":
     notifier = V2Notifier()
@@ -7,10 +7,13 @@ import json
 import logging
 import os
 import re
-import sqlite3
-from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import db_pool
+except ImportError:  # Imported as v2.<module>
+    from v2 import db_pool
 
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -27,21 +30,51 @@ logger = logging.getLogger(__name__)
 DB_PATH = Path(__file__).parent.parent / "data" / "v2" / "la_agenda_v2.db"
 CONFIG_PATH = Path(__file__).parent.parent / "config" / "v2.json"
 
+_config_cache: Dict[Path, Tuple[float, Dict]] = {}  # path -> (mtime, parsed config)
+
+# Shared statement text so the connection's statement cache hits
+SQL_TODAY_COUNT = """
+    SELECT COUNT(*) FROM outreach_log 
+    WHERE sent_at >= date('now') AND sent_at < date('now', '+1 day')
+"""
+SQL_CONTACTED = "SELECT email FROM outreach_log"
+SQL_INSERT_OUTREACH = """
+    INSERT INTO outreach_log (email, domain, justification, status, template_used)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SQL_STATS = """
+    SELECT COUNT(*),
+           COUNT(CASE WHEN sent_at >= date('now') AND sent_at < date('now', '+1 day') THEN 1 END),
+           COUNT(CASE WHEN status = 'replied' THEN 1 END)
+    FROM outreach_log
+"""
+
 class SafeOutreach:
     """Outreach system with safety guardrails."""
     
     def __init__(self):
         self.config = self._load_config()
         self.outreach_config = self.config.get("outreach", {})
+        blocked = self.outreach_config.get("blocked_keywords", [])
+        # All blocked keywords as one alternation: a single scan per email
+        self._blocked_re = re.compile("|".join(map(re.escape, blocked)), re.IGNORECASE) if blocked else None
+        self._allowed = frozenset(d.lower() for d in self.outreach_config.get("allowed_domains", []))
+        self._contacted: Optional[Set[str]] = None  # Loaded from outreach_log on first check
     
     def _load_config(self) -> Dict:
+        # Re-parse only when the file's mtime changes
+        mtime = CONFIG_PATH.stat().st_mtime
+        cached = _config_cache.get(CONFIG_PATH)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
         with open(CONFIG_PATH) as f:
-            return json.load(f)
+            config = json.load(f)
+        _config_cache[CONFIG_PATH] = (mtime, config)
+        return config
     
     def _get_db(self):
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get this thread's database connection."""
+        return db_pool.get_db(DB_PATH)
     
     def is_outreach_enabled(self) -> bool:
         """Check if outreach is enabled."""
@@ -52,15 +85,9 @@ class SafeOutreach:
         conn = self._get_db()
         cursor = conn.cursor()
         
-        today = datetime.now().strftime("%Y-%m-%d")
-        cursor.execute("""
-            SELECT COUNT(*) FROM outreach_log 
-            WHERE date(sent_at) = date('now')
-        """)
+        cursor.execute(SQL_TODAY_COUNT)
         
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        return cursor.fetchone()[0]
     
     def can_send_outreach(self, email: str, justification: str) -> tuple[bool, str]:
         """Check if outreach is allowed for this email."""
@@ -76,10 +103,9 @@ class SafeOutreach:
         
         # Check allowlist
         if self.outreach_config.get("allowlist_only", True):
-            allowed_domains = self.outreach_config.get("allowed_domains", [])
             domain = email.split("@")[-1].lower()
             
-            if domain not in allowed_domains:
+            if domain not in self._allowed:
                 return False, f"Domain '{domain}' not in allowlist"
         
         # Check justification required
@@ -88,41 +114,30 @@ class SafeOutreach:
                 return False, "Justification required (min 10 chars)"
         
         # Check blocked keywords
-        blocked = self.outreach_config.get("blocked_keywords", [])
-        email_lower = email.lower()
-        for keyword in blocked:
-            if keyword in email_lower:
-                return False, f"Email contains blocked keyword"
+        if self._blocked_re is not None and self._blocked_re.search(email):
+            return False, f"Email contains blocked keyword"
         
         # Check for duplicates (don't email same person twice)
-        conn = self._get_db()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT COUNT(*) FROM outreach_log WHERE email = ?",
-            (email,)
-        )
-        if cursor.fetchone()[0] > 0:
-            conn.close()
+        if email in self._get_contacted():
             return False, "Email already contacted"
         
-        conn.close()
         return True, "Approved"
     
+    def _get_contacted(self) -> Set[str]:
+        """Emails already in outreach_log (read once, then kept current by log_outreach_attempt)."""
+        if self._contacted is None:
+            self._contacted = {row[0] for row in self._get_db().execute(SQL_CONTACTED)}
+        return self._contacted
+    
     def log_outreach_attempt(self, email: str, justification: str, 
                             status: str, template: str = "default"):
         """Log outreach attempt for audit."""
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
         domain = email.split("@")[-1].lower()
         
-        cursor.execute("""
-            INSERT INTO outreach_log (email, domain, justification, status, template_used)
-            VALUES (?, ?, ?, ?, ?)
-        """, (email, domain, justification, status, template))
-        
-        conn.commit()
-        conn.close()
+        with self._get_db() as conn:
+            conn.execute(SQL_INSERT_OUTREACH, (email, domain, justification, status, template))
+        if self._contacted is not None:
+            self._contacted.add(email)
         
         logger.info(f"Outreach logged: {email} - {status}")
     
@@ -131,38 +146,26 @@ class SafeOutreach:
         self.config["outreach"]["allowed_domains"] = \
             self.config["outreach"].get("allowed_domains", []) + [domain]
         
-        with open(CONFIG_PATH, 'w') as f:
+        # Write to a temp file and rename over the original so readers never see a partial file
+        tmp = CONFIG_PATH.with_suffix('.json.tmp')
+        with open(tmp, 'w') as f:
             json.dump(self.config, f, indent=2)
+        os.replace(tmp, CONFIG_PATH)
+        self._allowed = self._allowed | {domain.lower()}
+        _config_cache[CONFIG_PATH] = (CONFIG_PATH.stat().st_mtime, self.config)
         
         logger.info(f"Added {domain} to allowlist")
     
     def get_outreach_stats(self) -> Dict:
         """Get outreach statistics."""
         conn = self._get_db()
-        cursor = conn.cursor()
-        
-        # Total sent
-        cursor.execute("SELECT COUNT(*) FROM outreach_log")
-        total = cursor.fetchone()[0]
         
-        # Today's sends
-        cursor.execute("""
-            SELECT COUNT(*) FROM outreach_log 
-            WHERE date(sent_at) = date('now')
-        """)
-        today = cursor.fetchone()[0]
-        
-        # Replies received
-        cursor.execute("""
-            SELECT COUNT(*) FROM outreach_log WHERE status = 'replied'
-        """)
-        replies = cursor.fetchone()[0]
+        # Total sent, today's sends and replies received in one pass
+        total, today, replies = conn.execute(SQL_STATS).fetchone()
         
         # Response rate
         response_rate = (replies / total * 100) if total > 0 else 0
         
-        conn.close()
-        
         return {
             "total_sent": total,
             "sent_today": today,
@@ -9,21 +9,25 @@ import hmac
 import json
 import logging
 import os
+import queue
 import sqlite3
 import sys
-from datetime import datetime, timedelta
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import time
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))  # for the shared .env loader
+from env_file import load_env
+
 # Load environment
-env_path = Path(__file__).parent.parent / ".env"
-if env_path.exists():
-    with open(env_path) as f:
-        for line in f:
-            if '=' in line and not line.startswith('#'):
-                key, value = line.strip().split('=', 1)
-                os.environ[key] = value
+load_env(Path(__file__).parent.parent / ".env")
 
 # Configuration
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY", "sk_test_xxx")
@@ -31,6 +35,9 @@ STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET", "whsec_xxx")
 STRIPE_PRO_PRICE_ID = os.environ.get("STRIPE_PRO_PRICE_ID", "price_xxx")
 STRIPE_ORG_PRICE_ID = os.environ.get("STRIPE_ORG_PRICE_ID", "price_xxx")
 
+# Reject signed webhooks older than this (Stripe's own default tolerance)
+WEBHOOK_TOLERANCE_SECONDS = 300
+
 DB_PATH = Path(__file__).parent.parent / "data" / "v2" / "la_agenda_v2.db"
 LOGS_DIR = Path(__file__).parent.parent / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
@@ -45,6 +52,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Shared statement text so every pooled connection's statement cache hits
+SQL_SET_PLAN = "UPDATE users SET plan = ?, billing_status = ? WHERE email = ?"
+SQL_SET_BILLING_STATUS = "UPDATE users SET billing_status = ? WHERE email = ?"
+SQL_BILLING_EVENT = """
+    INSERT INTO billing_events (user_id, event_type, amount_cents, details)
+    VALUES ((SELECT id FROM users WHERE email = ?), ?, ?, ?)
+"""
+
+
+def _dumps(obj) -> bytes:
+    """Encode a response body as JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _loads(data: bytes):
+    """Decode a JSON request body (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _verify_stripe_signature(payload: bytes, sig_header: str, secret: str,
+                             tolerance: int = WEBHOOK_TOLERANCE_SECONDS) -> bool:
+    """Check a Stripe-Signature header (t=...,v1=...) against the raw payload."""
+    timestamp = None
+    signatures = []
+    for item in (sig_header or '').split(','):
+        key, _, value = item.strip().partition('=')
+        if key == 't':
+            timestamp = value
+        elif key == 'v1':
+            signatures.append(value)
+    if not timestamp or not signatures:
+        return False
+    try:
+        if abs(time.time() - int(timestamp)) > tolerance:
+            return False
+    except ValueError:
+        return False
+    
+    expected = hmac.new(secret.encode(), timestamp.encode() + b'.' + payload, hashlib.sha256).hexdigest()
+    # Constant-time compare against every v1 (Stripe sends several while rolling secrets)
+    return any(hmac.compare_digest(expected, sig) for sig in signatures)
 
 class StripeHandler(BaseHTTPRequestHandler):
     """Handle Stripe webhooks and checkout."""
@@ -76,11 +126,34 @@ class StripeHandler(BaseHTTPRequestHandler):
         else:
             self._send_404()
     
-    def _get_db(self):
-        conn = sqlite3.connect(DB_PATH)
+    # Connections reused across request threads; SQLite still serializes the writes
+    pool = queue.LifoQueue(maxsize=4)
+    
+    @staticmethod
+    def _connect():
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         return conn
     
+    @classmethod
+    @contextmanager
+    def _db(cls):
+        """Borrow a pooled connection for one transaction (rolled back on error)."""
+        try:
+            conn = cls.pool.get_nowait()
+        except queue.Empty:
+            conn = cls._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            try:
+                cls.pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
     def _create_checkout_session(self, query):
         """Create Stripe Checkout session."""
         email = query.get('email', [''])[0]
@@ -91,18 +164,11 @@ class StripeHandler(BaseHTTPRequestHandler):
             return
         
         # Store pending checkout in database
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT OR REPLACE INTO billing_events (user_id, event_type, details, created_at)
-            VALUES ((SELECT id FROM users WHERE email = ?), 'checkout_started', ?, ?)
-        """, (email, json.dumps({"plan": plan}), datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+        with self._db() as conn:
+            conn.execute(SQL_BILLING_EVENT, (email, 'checkout_started', None, json.dumps({"plan": plan})))
         
         # In production, this would create actual Stripe session
+        # (POST via http_client.get_client() to reuse the pooled connection)
         # For now, return manual payment link
         checkout_url = f"https://buy.stripe.com/test_xxxx?prefilled_email={email}"
         
@@ -112,7 +178,7 @@ class StripeHandler(BaseHTTPRequestHandler):
             "plan": plan
         }
         
-        self._send_response(200, 'application/json', json.dumps(response).encode())
+        self._send_response(200, 'application/json', _dumps(response))
     
     def _handle_webhook(self):
         """Handle Stripe webhook events."""
@@ -120,95 +186,68 @@ class StripeHandler(BaseHTTPRequestHandler):
         payload = self.rfile.read(content_length)
         
         sig_header = self.headers.get('Stripe-Signature')
+        if not _verify_stripe_signature(payload, sig_header, STRIPE_WEBHOOK_SECRET):
+            logger.warning("Stripe webhook rejected: bad or missing signature")
+            self._send_response(400, 'application/json', _dumps({"error": "Invalid signature"}))
+            return
         
         try:
-            # In production, verify signature with STRIPE_WEBHOOK_SECRET
-            event = json.loads(payload)
+            event = _loads(payload)
+            # Store the signed event as received rather than re-encoding the parsed object
+            raw_event = payload.decode('utf-8')
             event_type = event.get('type')
             
             logger.info(f"Stripe webhook received: {event_type}")
             
             if event_type == 'checkout.session.completed':
-                self._handle_payment_success(event['data']['object'])
+                self._handle_payment_success(event['data']['object'], raw_event)
             elif event_type == 'invoice.payment_failed':
-                self._handle_payment_failure(event['data']['object'])
+                self._handle_payment_failure(event['data']['object'], raw_event)
             elif event_type == 'customer.subscription.deleted':
-                self._handle_subscription_cancelled(event['data']['object'])
+                self._handle_subscription_cancelled(event['data']['object'], raw_event)
             
-            self._send_response(200, 'application/json', json.dumps({"status": "ok"}).encode())
+            self._send_response(200, 'application/json', _dumps({"status": "ok"}))
             
         except Exception as e:
             logger.error(f"Webhook error: {e}")
-            self._send_response(400, 'application/json', json.dumps({"error": str(e)}).encode())
+            self._send_response(400, 'application/json', _dumps({"error": str(e)}))
     
-    def _handle_payment_success(self, session):
+    def _handle_payment_success(self, session, raw_event):
         """Process successful payment."""
         email = session.get('customer_email')
         plan = self._get_plan_from_session(session)
         
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        # Update user plan
-        cursor.execute("""
-            UPDATE users 
-            SET plan = ?, billing_status = 'active'
-            WHERE email = ?
-        """, (plan, email))
-        
-        # Log billing event
-        cursor.execute("""
-            INSERT INTO billing_events (user_id, event_type, amount_cents, details, created_at)
-            VALUES ((SELECT id FROM users WHERE email = ?), 'payment_success', ?, ?, ?)
-        """, (email, session.get('amount_total', 0), json.dumps(session), datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+        with self._db() as conn:
+            # Update user plan
+            conn.execute(SQL_SET_PLAN, (plan, 'active', email))
+            
+            # Log billing event
+            conn.execute(SQL_BILLING_EVENT, (email, 'payment_success', session.get('amount_total', 0), raw_event))
         
         # Send welcome email
         self._send_upgrade_email(email, plan)
         
         logger.info(f"✅ User upgraded: {email} to {plan}")
     
-    def _handle_payment_failure(self, invoice):
+    def _handle_payment_failure(self, invoice, raw_event):
         """Handle failed payment."""
         email = invoice.get('customer_email')
         
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE users SET billing_status = 'payment_failed' WHERE email = ?
-        """, (email,))
-        
-        cursor.execute("""
-            INSERT INTO billing_events (user_id, event_type, details, created_at)
-            VALUES ((SELECT id FROM users WHERE email = ?), 'payment_failed', ?, ?)
-        """, (email, json.dumps(invoice), datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+        with self._db() as conn:
+            conn.execute(SQL_SET_BILLING_STATUS, ('payment_failed', email))
+            
+            conn.execute(SQL_BILLING_EVENT, (email, 'payment_failed', None, raw_event))
         
         logger.warning(f"⚠️ Payment failed: {email}")
     
-    def _handle_subscription_cancelled(self, subscription):
+    def _handle_subscription_cancelled(self, subscription, raw_event):
         """Handle cancelled subscription."""
         email = subscription.get('customer_email')
         
-        conn = self._get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE users SET plan = 'free', billing_status = 'cancelled' WHERE email = ?
-        """, (email,))
-        
-        cursor.execute("""
-            INSERT INTO billing_events (user_id, event_type, details, created_at)
-            VALUES ((SELECT id FROM users WHERE email = ?), 'cancelled', ?, ?)
-        """, (email, json.dumps(subscription), datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+        with self._db() as conn:
+            conn.execute(SQL_SET_PLAN, ('free', 'cancelled', email))
+            
+            conn.execute(SQL_BILLING_EVENT, (email, 'cancelled', None, raw_event))
         
         logger.info(f"📤 Subscription cancelled: {email}")
     
@@ -319,7 +358,13 @@ LA Agenda Alerts Team
 def run_server(port=8081):
     """Run Stripe webhook server."""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, StripeHandler)
+    httpd = ThreadingHTTPServer(server_address, StripeHandler)
+    
+    # Open a connection up front, before the first webhook
+    try:
+        StripeHandler.pool.put_nowait(StripeHandler._connect())
+    except sqlite3.OperationalError as e:
+        logger.warning(f"Database not available yet: {e}")
     logger.info(f"Stripe server running at http://localhost:{port}")
     print(f"\n💳 Stripe Webhook: http://localhost:{port}/stripe/webhook")
     print("Press Ctrl+C to stop\n")